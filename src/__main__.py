@@ -1,22 +1,123 @@
 """コンサートチケット抽選シミュレーターのメイン実行モジュール"""
 
-from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import contextlib
+import functools
+import io
+import multiprocessing
+import sys
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
 
-from .lottery.lottery_simulator import LotterySimulator
+from .lottery.lottery_simulator import (
+    LotterySimulator,
+    format_final_probabilities,
+    resolve_reduction_rate,
+)
+from .lottery.lottery_stage import FrozenStage, freeze_stages
 from .utils.config_loader import load_config
 from .utils.plotter import plot_probability_comparison
 
+CaseArgs = Tuple[
+    Dict[str, Any],
+    Dict[str, int],
+    Dict[str, Any],
+    str,
+    Sequence[Tuple[str, float, int, float]],
+]
+
+
+def _freeze(value: Any) -> Hashable:
+    """設定の辞書やリストを、キャッシュのキーとして使える不変の値に変換する関数
+
+    Args:
+        value (Any): 変換する値（辞書、リスト、またはハッシュ可能な値）
+
+    Returns:
+        Hashable: 辞書はキーでソートした (key, value) のタプル、リストはタプルに変換した値
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@functools.lru_cache(maxsize=64)
+def _simulate_case(
+    frozen_settings: Hashable,
+    frozen_target_events: Hashable,
+    frozen_duplicate_config: Hashable,
+    stages_def: Tuple[Tuple[str, float, int, float], ...],
+) -> LotterySimulator:
+    """不変化した入力からシミュレーターを構築し、確率計算まで行う内部関数
+
+    同じ入力での呼び出しはlru_cacheにより計算済みのシミュレーターを再利用します。
+    返されるシミュレーターはキャッシュと共有されるため、変更しないこと。
+
+    Args:
+        frozen_settings (Hashable): _freezeで変換したシミュレーションの基本設定
+        frozen_target_events (Hashable): _freezeで変換したユーザーが申し込む公演の詳細
+        frozen_duplicate_config (Hashable): _freezeで変換した重複当選の設定
+        stages_def (Tuple[Tuple[str, float, int, float], ...]): 各選考ステージの定義のタプル
+
+    Returns:
+        LotterySimulator: 確率計算済みのシミュレーター
+    """
+    simulator = _build_simulator(
+        dict(frozen_settings),
+        dict(frozen_target_events),
+        dict(frozen_duplicate_config),
+        stages_def,
+    )
+    simulator.calculate_probabilities()
+    return simulator
+
+
+def _build_simulator(
+    simulation_settings: Dict[str, Any],
+    user_target_events_details: Dict[str, int],
+    duplicate_config: Dict[str, Any],
+    stages_def: Sequence[Tuple[str, float, int, float]],
+) -> LotterySimulator:
+    """設定とステージ定義からシミュレーターを構築する内部関数
+
+    Args:
+        simulation_settings (dict): シミュレーションの基本設定
+        user_target_events_details (Dict[str, int]): ユーザーが申し込む公演の詳細
+        duplicate_config (Dict[str, Any]): 重複当選の設定
+        stages_def (Sequence[Tuple[str, float, int, float]]): 各選考ステージの定義のリスト
+            freeze_stagesで検証済みのFrozenStagesを渡した場合は再検証を省略する
+
+    Returns:
+        LotterySimulator: ステージを設定済みのシミュレーター（確率は未計算）
+    """
+    simulator = LotterySimulator(
+        simulation_settings["total_overall_attendance"],
+        simulation_settings["num_total_events"],
+        user_target_events_details,
+        simulation_settings["core_fan_total_population"],
+        duplicate_config,
+    )
+    if stages_def and all(isinstance(stage, FrozenStage) for stage in stages_def):
+        simulator.set_stages(stages_def)
+    else:
+        for stage_args in stages_def:
+            simulator.add_stage(*stage_args)
+    return simulator
+
 
 def run_and_collect_results(
     simulation_settings: Dict[str, Any],
     user_target_events_details: Dict[str, int],
     duplicate_config: Dict[str, Any],
     case_name: str,
-    stages_def: List[Tuple[str, float, int, float]],
+    stages_def: Sequence[Tuple[str, float, int, float]],
 ) -> Optional[Dict[str, float]]:
     """シミュレーションを実行し結果を収集する関数
 
     指定された設定でシミュレーターを初期化し、計算を実行して結果を返します。
+    同じ設定での計算結果はキャッシュされ、再計算せずに表示と返却のみ行います。
     エラーが発生した場合はエラーメッセージを表示し、Noneを返します。
 
     Args:
@@ -24,8 +125,9 @@ def run_and_collect_results(
         user_target_events_details (Dict[str, int]): ユーザーが申し込む公演の詳細
         duplicate_config (Dict[str, Any]): 重複当選の設定
         case_name (str): シミュレーションケースの名前（ログ表示用）
-        stages_def (List[Tuple[str, float, int, float]]): 各選考ステージの定義のリスト
+        stages_def (Sequence[Tuple[str, float, int, float]]): 各選考ステージの定義のリスト
             各要素は (name: str, applicant_core_fan_ratio: float, additional_applicants: int, weight: float) の形式
+            freeze_stagesで検証済みのFrozenStagesを渡した場合は再検証を省略する
 
     Returns:
         dict or None: 計算された当選確率の内訳。エラーが発生した場合はNone
@@ -33,19 +135,15 @@ def run_and_collect_results(
     print(f"\n--- シミュレーション開始: {case_name} ---")
 
     try:
-        simulator = LotterySimulator(
-            simulation_settings["total_overall_attendance"],
-            simulation_settings["num_total_events"],
-            user_target_events_details,
-            simulation_settings["core_fan_total_population"],
-            duplicate_config,
+        simulator = _simulate_case(
+            _freeze(simulation_settings),
+            _freeze(user_target_events_details),
+            # 未設定(None)の重複当選設定は、LotterySimulatorと同様に設定なしとして扱う
+            _freeze(duplicate_config or {}),
+            tuple(stages_def),
         )
-        for stage_args in stages_def:
-            simulator.add_stage(*stage_args)
-
-        simulator.calculate_probabilities()
         simulator.display_results(display_details=False)
-        return simulator.final_probabilities
+        return dict(simulator.final_probabilities)
     except ValueError as e:
         print(f"設定エラー ({case_name}): {e}")
         return None
@@ -54,10 +152,214 @@ def run_and_collect_results(
         return None
 
 
-def main() -> None:
-    """メイン処理"""
-    config = load_config()  # config.jsonをデフォルトで読み込む
-    print(config)
+def _run_case_entry(case_args: CaseArgs) -> Optional[Dict[str, float]]:
+    """1ケース分のシミュレーションを実行する関数
+
+    Args:
+        case_args (CaseArgs): run_and_collect_resultsに渡す引数のタプル
+
+    Returns:
+        dict or None: 計算された当選確率の内訳。エラーが発生した場合はNone
+    """
+    print(f"\n--- シミュレーションケース: {case_args[3]} ---")
+    return run_and_collect_results(*case_args)
+
+
+def _run_case_entry_captured(
+    case_args: CaseArgs,
+) -> Tuple[Optional[Dict[str, float]], str]:
+    """ワーカープロセスで1ケース分のシミュレーションを実行する関数
+
+    並列実行時にケースごとの表示が混ざらないよう、表示内容を文字列として
+    親プロセスに返します。
+
+    Args:
+        case_args (CaseArgs): run_and_collect_resultsに渡す引数のタプル
+
+    Returns:
+        Tuple[dict or None, str]: 計算結果と表示内容
+    """
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        results = _run_case_entry(case_args)
+    return results, buffer.getvalue()
+
+
+def run_cases(
+    case_args_list: List[CaseArgs], jobs: int = 1
+) -> List[Optional[Dict[str, float]]]:
+    """複数のシミュレーションケースを実行する関数
+
+    1ケースの計算は0.1ms程度で終わり、プロセスプールの起動コストの方が大きいため、
+    既定では直列に実行します。jobsに2以上を指定した場合のみプロセスプールで
+    並列に実行します。結果と表示は入力と同じケース順になります。
+
+    Args:
+        case_args_list (List[CaseArgs]): 各ケースのrun_and_collect_resultsの引数のリスト
+        jobs (int, optional): 並列実行に使うプロセス数。デフォルトは1（直列に実行）
+
+    Returns:
+        List[dict or None]: 各ケースの計算結果のリスト
+    """
+    if jobs <= 1 or len(case_args_list) < 2:
+        return [_run_case_entry(case_args) for case_args in case_args_list]
+
+    with multiprocessing.Pool(processes=jobs) as pool:
+        outputs = pool.map(_run_case_entry_captured, case_args_list)
+    results_list = []
+    for results, output in outputs:
+        sys.stdout.write(output)
+        results_list.append(results)
+    return results_list
+
+
+def _format_case_error(case_name: str, error: Exception) -> str:
+    """run_and_collect_resultsと同じ形式で、ケースのエラーメッセージを組み立てる関数
+
+    Args:
+        case_name (str): シミュレーションケースの名前
+        error (Exception): 発生した例外
+
+    Returns:
+        str: ValueErrorは設定エラー、それ以外は予期せぬエラーとしたメッセージ
+    """
+    if isinstance(error, ValueError):
+        return f"設定エラー ({case_name}): {error}"
+    return f"予期せぬエラー ({case_name}): {error}"
+
+
+def run_cases_sweep(
+    case_args_list: List[CaseArgs], jobs: int = 1
+) -> List[Optional[Dict[str, float]]]:
+    """座席減少率だけが異なる複数のケースを一括計算で実行する関数
+
+    全ケースで基本設定・公演の詳細・ステージ定義が共通の場合は、シミュレーターを
+    一度だけ構築し、全ケースの確率をまとめて計算します。表示は各ケースの最終的な
+    当選確率の内訳のみです。重複当選の設定以外が異なるケースが含まれる場合は、
+    その旨を表示してrun_casesによる個別実行に切り替えます。
+
+    Args:
+        case_args_list (List[CaseArgs]): 各ケースのrun_and_collect_resultsの引数のリスト
+        jobs (int, optional): 個別実行に切り替えた場合にrun_casesへ渡すプロセス数。デフォルトは1
+
+    Returns:
+        List[dict or None]: 各ケースの計算結果のリスト。エラーが発生したケースはNone
+    """
+    if not case_args_list:
+        return []
+
+    simulation_settings, user_target_events_details, _, _, stages_def = case_args_list[
+        0
+    ]
+    shared_args = (simulation_settings, user_target_events_details, tuple(stages_def))
+    mismatched_names = [
+        case_args[3]
+        for case_args in case_args_list[1:]
+        if (case_args[0], case_args[1], tuple(case_args[4])) != shared_args
+    ]
+    if mismatched_names:
+        print(
+            "重複当選の設定以外が異なるケースがあるため、一括計算せず個別に実行します: "
+            + ", ".join(mismatched_names)
+        )
+        return run_cases(case_args_list, jobs=jobs)
+
+    results_list: List[Optional[Dict[str, float]]] = [None] * len(case_args_list)
+    errors: Dict[int, str] = {}
+    valid_indices = []
+    rates = []
+    for index, case_args in enumerate(case_args_list):
+        try:
+            rates.append(resolve_reduction_rate(case_args[2])[1])
+            valid_indices.append(index)
+        except Exception as e:
+            errors[index] = _format_case_error(case_args[3], e)
+
+    try:
+        simulator = _build_simulator(
+            simulation_settings, user_target_events_details, {}, stages_def
+        )
+        for index, results in zip(
+            valid_indices, simulator.sweep_reduction_rates(rates)
+        ):
+            results_list[index] = results
+    except Exception as e:
+        for index in valid_indices:
+            errors[index] = _format_case_error(case_args_list[index][3], e)
+
+    lines = []
+    for index, case_args in enumerate(case_args_list):
+        lines.append(f"\n--- シミュレーションケース: {case_args[3]} ---")
+        if index in errors:
+            lines.append(errors[index])
+        else:
+            lines.extend(format_final_probabilities(results_list[index]))
+    sys.stdout.write("\n".join(lines) + "\n")
+    return results_list
+
+
+def _positive_int(value: str) -> int:
+    """コマンドライン引数を1以上の整数として解釈する関数
+
+    Args:
+        value (str): コマンドラインで指定された値
+
+    Returns:
+        int: 解釈した整数
+
+    Raises:
+        argparse.ArgumentTypeError: 1以上の整数でない場合
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"1以上の整数を指定してください: {value}")
+    return number
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """コマンドライン引数を解析する関数
+
+    Args:
+        argv (Sequence[str], optional): 解析する引数のリスト。Noneの場合はsys.argvを使用
+
+    Returns:
+        argparse.Namespace: 解析結果
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src", description="コンサートチケット抽選シミュレーター"
+    )
+    parser.add_argument(
+        "--verbose-config",
+        action="store_true",
+        help="読み込んだ設定内容をそのまま表示する",
+    )
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="全ケースを座席減少率の一括計算でまとめて実行する（結果の内訳のみ表示）",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=_positive_int,
+        default=1,
+        help="ケースを並列実行するプロセス数（デフォルトは1で直列に実行）",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """メイン処理
+
+    Args:
+        argv (Sequence[str], optional): コマンドライン引数。Noneの場合はsys.argvを使用
+    """
+    args = parse_args(argv)
+    config = load_config(use_cache=True)  # config.jsonをデフォルトで読み込む
+    if args.verbose_config:
+        print(config)
 
     simulation_settings = config["simulation_settings"]
     user_target_events_details = config["user_target_events_details"]
@@ -73,34 +375,43 @@ def main() -> None:
         )
         for stage in lottery_stages_config
     ]
+    # ステージ定義は全ケース共通のため、検証はここで一度だけ行う
+    try:
+        frozen_stages = freeze_stages(stages_definition_list)
+    except ValueError as e:
+        print(f"設定エラー: {e}")
+        return
 
-    stage_name_mapping_for_plot = {
+    # グラフ描画側で並び順と表示名の計算結果を再利用できるよう、変更不可のマッピングにする
+    stage_name_mapping = {
         f"{stage['name']}で当選": stage[
             "name"
         ]  # Use the full stage name for the legend
         for stage in lottery_stages_config
     }
-    stage_name_mapping_for_plot["全選考で落選"] = "全滅"
+    stage_name_mapping["全選考で落選"] = "全滅"
+    stage_name_mapping_for_plot = MappingProxyType(stage_name_mapping)
 
     all_results_for_plotting = []
     all_case_names_for_plotting = []
 
-    for case_config in simulation_cases_config:
-        case_name = case_config["case_name"]
-        duplicate_config = case_config["duplicate_config"]
-
-        print(f"\n--- シミュレーションケース: {case_name} ---")
-        results = run_and_collect_results(
+    case_args_list = [
+        (
             simulation_settings,
             user_target_events_details,
-            duplicate_config,
-            case_name,
-            stages_definition_list,
+            case_config["duplicate_config"],
+            case_config["case_name"],
+            frozen_stages,
         )
-
+        for case_config in simulation_cases_config
+    ]
+    runner = run_cases_sweep if args.sweep else run_cases
+    for case_config, results in zip(
+        simulation_cases_config, runner(case_args_list, jobs=args.jobs)
+    ):
         if results:
             all_results_for_plotting.append(results)
-            all_case_names_for_plotting.append(case_name)
+            all_case_names_for_plotting.append(case_config["case_name"])
 
     if len(all_results_for_plotting) >= 2:
         plot_probability_comparison(
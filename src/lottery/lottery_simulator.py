@@ -1,6 +1,267 @@
 """LotterySimulatorクラスの定義モジュール"""
 
-from .lottery_stage import LotteryStage
+import functools
+import operator
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from .lottery_stage import FrozenStages, LotteryStage, validate_stage_params
+from .stage_table import StageTable
+
+try:
+    from numba import njit
+except ImportError:  # numbaが無い環境では同じ関数を純Pythonとして実行する
+
+    def njit(*args, **kwargs):
+        """numba.njitの代替として関数をそのまま返すデコレーター"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def _compute_stage_probs(
+    premise: np.ndarray, effective: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """各ステージの実質申込者数、当選者数、条件付き当選確率を計算する関数
+
+    前ステージまでの当選者数に依存する逐次計算のため、numbaが利用可能な場合は
+    JITコンパイルして実行します。
+
+    Args:
+        premise (np.ndarray): 各ステージの前提申込者数
+        effective (np.ndarray): 各ステージの新規当選者向け有効席数
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: (実質申込者数, 当選者数, 条件付き当選確率)
+    """
+    num_stages = premise.shape[0]
+    winners = np.zeros(num_stages, dtype=np.int64)
+    # 有効席数または前提申込者数が0のステージは当選者が出ないため、逐次計算から除外する
+    active_stages = np.nonzero((effective > 0) & (premise > 0))[0]
+    cumulative_new_winners = 0
+    for i in active_stages:
+        actual_applicants = premise[i] - cumulative_new_winners
+        if actual_applicants > 0:
+            winners[i] = min(actual_applicants, effective[i])
+            cumulative_new_winners += winners[i]
+
+    # 実質申込者数は、各ステージより前の当選者数の累積から一括で求める
+    cumulative_before = np.zeros(num_stages, dtype=np.int64)
+    cumulative_before[1:] = np.cumsum(winners)[:-1]
+    actual = np.maximum(premise - cumulative_before, 0)
+    cond_prob = np.zeros(num_stages)
+    has_winners = winners > 0
+    cond_prob[has_winners] = winners[has_winners] / actual[has_winners]
+    return actual, winners, cond_prob
+
+
+def resolve_reduction_rate(duplicate_当選_config: dict) -> Tuple[bool, float]:
+    """重複当選の設定から、計算で使う座席減少率を求める関数
+
+    Args:
+        duplicate_当選_config (dict): 重複当選の設定（type, rateなど）。Noneまたは空でも可
+
+    Returns:
+        Tuple[bool, float]: (座席減少方式かどうか, 座席減少率)。座席減少方式でない場合の減少率は0.0
+
+    Raises:
+        ValueError: 座席減少率が0.0から1.0の範囲外の場合
+    """
+    config = duplicate_当選_config if duplicate_当選_config else {}
+    is_seat_reduction = config.get("type") == "seat_reduction"
+    reduction_rate = float(config.get("rate", 0.0)) if is_seat_reduction else 0.0
+    if not (0.0 <= reduction_rate <= 1.0):
+        raise ValueError("座席減少率は0.0から1.0の間である必要があります。")
+    return is_seat_reduction, reduction_rate
+
+
+def _allocate_seats(
+    weights: np.ndarray, total_weight: float, total_seats: float
+) -> np.ndarray:
+    """各ステージの重みに基づいて座席を配分する関数
+
+    最終ステージは端数を吸収し、配分合計が四捨五入した総座席数と一致するようにします。
+
+    Args:
+        weights (np.ndarray): 各ステージの座席配分の重み付け係数
+        total_weight (float): 全ステージの重み合計
+        total_seats (float): ユーザーが申し込む公演の総座席数
+
+    Returns:
+        np.ndarray: 各ステージに割り当てられた席数（int64）
+    """
+    seats = np.rint(total_seats * (weights / total_weight)).astype(np.int64)
+    seats[-1] = np.int64(np.rint(total_seats)) - seats[:-1].sum()
+    return seats
+
+
+def _premise_applicants(
+    ratios: np.ndarray, additional: np.ndarray, core_pop: int
+) -> np.ndarray:
+    """各ステージの前提申込者数を計算する関数
+
+    Args:
+        ratios (np.ndarray): 各ステージのコアファンの申込割合（0.0〜1.0）
+        additional (np.ndarray): 各ステージのコアファン以外の追加申込者数
+        core_pop (int): コアファンの総人口
+
+    Returns:
+        np.ndarray: 各ステージの前提申込者数（int64）
+    """
+    return np.rint(core_pop * ratios).astype(np.int64) + additional
+
+
+def _effective_seats(allocated: np.ndarray, reduction_rate) -> np.ndarray:
+    """座席配分と座席減少率から、新規当選者向けの有効座席数を計算する関数
+
+    Args:
+        allocated (np.ndarray): 各ステージに割り当てられた席数
+        reduction_rate (float or np.ndarray): 新規当選者向け座席の減少率（0.0〜1.0）。
+            形状(C, 1)の配列を渡すと、C個の減少率の有効座席数を形状(C, S)でまとめて計算する
+
+    Returns:
+        np.ndarray: 各ステージの新規当選者向けの有効座席数（int64）
+    """
+    return np.rint(allocated * (1 - reduction_rate)).astype(np.int64)
+
+
+def _sweep_final_probs(
+    allocated: np.ndarray, premise: np.ndarray, rates: np.ndarray
+) -> np.ndarray:
+    """座席配分と前提申込者数から、複数の座席減少率の最終当選確率を一括で計算する関数
+
+    ケースごとにループする代わりに、累積当選者数をケース数分の配列として持ち、
+    ステージ方向に1段ずつ全ケースを同時に更新します。
+
+    Args:
+        allocated (np.ndarray): 各ステージに割り当てられた席数（長さS）
+        premise (np.ndarray): 各ステージの前提申込者数（長さS）
+        rates (np.ndarray): 各ケースの座席減少率（長さC）
+
+    Returns:
+        np.ndarray: 形状(C, S+1)の確率。列iはステージiで当選する確率、最終列は全選考で落選する確率
+
+    Raises:
+        ValueError: 座席減少率が0.0から1.0の範囲外の場合
+    """
+    rates = np.asarray(rates, dtype=np.float64)
+    if np.any((rates < 0.0) | (rates > 1.0)):
+        raise ValueError("座席減少率は0.0から1.0の間である必要があります。")
+
+    effective = _effective_seats(allocated, rates[:, None])
+    num_cases, num_stages = effective.shape
+    cond_prob = np.zeros((num_cases, num_stages))
+    cumulative_new_winners = np.zeros(num_cases, dtype=np.int64)
+    for i in range(num_stages):
+        actual = np.maximum(premise[i] - cumulative_new_winners, 0)
+        winners = np.minimum(actual, np.maximum(effective[:, i], 0))
+        has_winners = winners > 0
+        cond_prob[has_winners, i] = winners[has_winners] / actual[has_winners]
+        cumulative_new_winners += winners
+
+    survival = np.cumprod(1.0 - cond_prob, axis=1)
+    final_probs = np.empty((num_cases, num_stages + 1))
+    final_probs[:, 0] = cond_prob[:, 0]
+    final_probs[:, 1:num_stages] = survival[:, :-1] * cond_prob[:, 1:]
+    final_probs[:, num_stages] = survival[:, -1]
+    return final_probs
+
+
+class _StageSolution(NamedTuple):
+    """_solve_stagesの計算結果
+
+    lru_cacheで共有されるため、配列はすべて読み取り専用です。
+    """
+
+    allocated: np.ndarray
+    effective: np.ndarray
+    premise: np.ndarray
+    actual: np.ndarray
+    winners: np.ndarray
+    cond_prob: np.ndarray
+    final_probs: Tuple[float, ...]
+
+
+@functools.lru_cache(maxsize=128)
+def _solve_invariants(
+    stage_params: Tuple[Tuple[float, float, int], ...],
+    total_weight: float,
+    total_seats: float,
+    core_pop: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """重複当選の設定に依存しない座席配分と前提申込者数を求める関数
+
+    座席減少率だけを変えて計算し直す場合に再利用できるよう、_solve_stagesとは
+    別にlru_cacheで結果を保持します。返す配列はキャッシュと共有されるため読み取り専用です。
+
+    Args:
+        stage_params (Tuple[Tuple[float, float, int], ...]): 各ステージの (重み, コアファンの申込割合, 追加申込者数)
+        total_weight (float): 全ステージの重み合計
+        total_seats (float): ユーザーが申し込む公演の総座席数
+        core_pop (int): コアファンの総人口
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 各ステージの座席配分と前提申込者数
+    """
+    weights, ratios, additional = zip(*stage_params)
+    allocated = _allocate_seats(
+        np.array(weights, dtype=np.float64), total_weight, total_seats
+    )
+    premise = _premise_applicants(
+        np.array(ratios, dtype=np.float64),
+        np.array(additional, dtype=np.int64),
+        core_pop,
+    )
+    allocated.flags.writeable = False
+    premise.flags.writeable = False
+    return allocated, premise
+
+
+@functools.lru_cache(maxsize=128)
+def _solve_stages(
+    stage_params: Tuple[Tuple[float, float, int], ...],
+    total_weight: float,
+    total_seats: float,
+    core_pop: int,
+    reduction_rate: float,
+) -> _StageSolution:
+    """全ステージの計算結果と最終的な当選確率を求める関数
+
+    入力だけで結果が決まる純粋な計算のため、同じ入力での呼び出しは
+    lru_cacheにより計算済みの結果を再利用します。座席配分と前提申込者数は
+    _solve_invariantsから取得するため、座席減少率だけが異なる呼び出しでも再計算しません。
+
+    Args:
+        stage_params (Tuple[Tuple[float, float, int], ...]): 各ステージの (重み, コアファンの申込割合, 追加申込者数)
+        total_weight (float): 全ステージの重み合計
+        total_seats (float): ユーザーが申し込む公演の総座席数
+        core_pop (int): コアファンの総人口
+        reduction_rate (float): 新規当選者向け座席の減少率（0.0〜1.0）
+
+    Returns:
+        _StageSolution: 各ステージの計算結果の配列と、各ステージで当選する確率および
+            全選考で落選する確率（最後の要素）のタプル
+    """
+    allocated, premise = _solve_invariants(
+        stage_params, total_weight, total_seats, core_pop
+    )
+    effective = _effective_seats(allocated, reduction_rate)
+    actual, winners, cond_prob = _compute_stage_probs(premise, effective)
+
+    # 各ステージまで未当選で到達する確率は、前ステージまでの落選確率の累積積
+    survival = np.cumprod(1.0 - cond_prob)
+    reach = np.ones(len(cond_prob))
+    reach[1:] = survival[:-1]
+    final_probs = tuple((reach * cond_prob).tolist()) + (float(survival[-1]),)
+
+    for array in (effective, actual, winners, cond_prob):
+        array.flags.writeable = False
+    return _StageSolution(
+        allocated, effective, premise, actual, winners, cond_prob, final_probs
+    )
 
 
 class LotterySimulator:
@@ -14,8 +275,9 @@ class LotterySimulator:
         num_total_events (int): 全公演数
         user_target_events_details (dict): ユーザーが申し込む公演の詳細（地域ごとの公演数）
         core_fan_total_population (int): コアファンの総人口
-        duplicate_当選_config (dict): 重複当選の設定（type, rateなど）
+        duplicate_当選_config (Mapping): 重複当選の設定（type, rateなど）の読み取り専用のコピー
         stages (list): 追加された選考ステージのリスト
+        stage_table (StageTable): 計算に用いる全ステージの配列表現（計算前はNone）
         total_weight (float): 全ステージの重み合計
         seats_per_event (float): 1公演あたりの座席数
         user_total_target_events (int): ユーザーが申し込む公演の総数
@@ -43,15 +305,14 @@ class LotterySimulator:
                 例: {"type": "seat_reduction", "rate": 0.1} - 新規当選枠を10%減らす設定
 
         Raises:
-            ValueError: 総公演数またはユーザーが申し込む公演数が0以下の場合
+            ValueError: 総公演数またはユーザーが申し込む公演数が0以下の場合、または
+                       座席減少率が0.0から1.0の範囲外の場合
         """
         self.total_overall_attendance = total_overall_attendance
         self.num_total_events = num_total_events
         self.user_target_events_details = user_target_events_details
         self.core_fan_total_population = core_fan_total_population
-        self.duplicate_当選_config = (
-            duplicate_当選_config if duplicate_当選_config else {}
-        )
+        self.duplicate_当選_config = duplicate_当選_config
         self.stages = []
         self.total_weight = 0
         if self.num_total_events <= 0:
@@ -65,9 +326,44 @@ class LotterySimulator:
         self.total_seats_for_user_events = (
             self.seats_per_event * self.user_total_target_events
         )
+        self._clear_results()
+
+    def _clear_results(self) -> None:
+        """ステージの配列表現と計算結果を未計算の状態に戻す内部メソッド
+
+        ステージが変更された後に、変更前のステージの計算結果が表示されないようにします。
+        """
+        self.stage_table = None
+        self._solution = None
         self.results_per_stage_raw = []
         self.final_probabilities = {}
 
+    @property
+    def duplicate_当選_config(self) -> Mapping[str, Any]:
+        """重複当選の設定（type, rateなど）
+
+        座席減少率は設定時に一度だけ求めるため、読み取り専用のコピーを返します。
+        設定を変更する場合は、新しい辞書を代入してください。
+        """
+        return self._duplicate_当選_config
+
+    @duplicate_当選_config.setter
+    def duplicate_当選_config(self, duplicate_当選_config: dict) -> None:
+        """重複当選の設定を更新し、計算で使う座席減少率を一度だけ求めるセッター
+
+        Raises:
+            ValueError: 座席減少率が0.0から1.0の範囲外の場合
+        """
+        is_seat_reduction, reduction_rate = resolve_reduction_rate(
+            duplicate_当選_config
+        )
+        # 設定後に元の辞書を変更しても座席減少率と食い違わないよう、コピーを保持する
+        self._duplicate_当選_config = MappingProxyType(
+            dict(duplicate_当選_config) if duplicate_当選_config else {}
+        )
+        self._is_seat_reduction = is_seat_reduction
+        self._reduction_rate = reduction_rate
+
     def add_stage(
         self,
         name: str,
@@ -86,23 +382,76 @@ class LotterySimulator:
         Raises:
             ValueError: パラメータが不正な値の場合（申込割合が0-1の範囲外、追加申込者数が負、比重が0以下）
         """
-        if not (0.0 <= applicant_core_fan_ratio <= 1.0):
-            raise ValueError(
-                f"ステージ「{name}」のコアファン申込割合は0.0から1.0の間である必要があります。"
-            )
-        if additional_applicants < 0:
-            raise ValueError(
-                f"ステージ「{name}」の追加申込者数は0以上である必要があります。"
-            )
-        if weight <= 0:
-            raise ValueError(
-                f"ステージ「{name}」の比重は0より大きい値である必要があります。"
-            )
+        validate_stage_params(
+            name, applicant_core_fan_ratio, additional_applicants, weight
+        )
         stage = LotteryStage(
             name, applicant_core_fan_ratio, additional_applicants, weight
         )
         self.stages.append(stage)
         self.total_weight += weight
+        self._clear_results()
+
+    def set_stages(self, frozen_stages: FrozenStages) -> None:
+        """検証済みの選考ステージ定義でステージを一括設定するメソッド
+
+        freeze_stagesで検証済みのステージ定義を受け取るため、add_stageのような
+        ステージごとのパラメータ検証は行いません。既存のステージは置き換えられます。
+
+        Args:
+            frozen_stages (FrozenStages): freeze_stagesで生成した検証済みのステージ定義
+        """
+        self.stages = [LotteryStage(*stage) for stage in frozen_stages]
+        self.total_weight = sum(stage.weight for stage in frozen_stages)
+        self._clear_results()
+
+    def _current_stage_params(
+        self,
+    ) -> Tuple[Tuple[Tuple[float, float, int], ...], float]:
+        """現在のステージ定義から、計算結果のキャッシュのキーを組み立てる内部メソッド
+
+        stagesやその要素の属性が直接変更された場合にも古い結果を使わないよう、
+        呼び出しの度にstagesから組み立て直します。シミュレーターの状態は変更しません。
+
+        Returns:
+            Tuple[Tuple[Tuple[float, float, int], ...], float]: 各ステージの
+                (重み, コアファンの申込割合, 追加申込者数) のタプルと、現在のステージの重み合計
+
+        Raises:
+            ValueError: ステージが追加されているが比重の合計が0の場合
+        """
+        stage_params = tuple(
+            (stage.weight, stage.applicant_core_fan_ratio, stage.additional_applicants)
+            for stage in self.stages
+        )
+        total_weight = sum(weight for weight, _, _ in stage_params)
+        if total_weight == 0:
+            raise ValueError("選考ステージが追加されていますが、比重の合計が0です。")
+        return stage_params, total_weight
+
+    def _compute_stage_invariants(self) -> StageTable:
+        """重複当選の設定に依存しない値を計算する内部メソッド
+
+        各ステージの重みに基づく座席配分と、各ステージの前提申込者数を計算します。
+        テーブルは現在のステージから毎回作り直し、計算結果は_solve_invariantsの
+        キャッシュからステージ定義が同じ場合に再利用します。
+        calculate_probabilitiesの計算結果を保持するstage_tableは変更しません。
+
+        Returns:
+            StageTable: 座席配分と前提申込者数のみを計算済みの新しいテーブル
+
+        Raises:
+            ValueError: ステージが追加されているが比重の合計が0の場合
+        """
+        stage_params, total_weight = self._current_stage_params()
+        table = StageTable.from_stages(self.stages)
+        table.allocated, table.premise = _solve_invariants(
+            stage_params,
+            total_weight,
+            self.total_seats_for_user_events,
+            self.core_fan_total_population,
+        )
+        return table
 
     def _allocate_seats_to_stages(self) -> None:
         """各選考ステージに座席を配分する内部メソッド
@@ -111,35 +460,15 @@ class LotterySimulator:
         新規当選者向けの有効座席数を計算します。
 
         Raises:
-            ValueError: ステージが追加されているが比重の合計が0の場合、または
-                       座席減少率が0.0から1.0の範囲外の場合
+            ValueError: ステージが追加されているが比重の合計が0の場合
         """
-        if self.total_weight == 0 and self.stages:
-            raise ValueError("選考ステージが追加されていますが、比重の合計が0です。")
         if not self.stages:
             return
 
-        running_allocated_sum = 0
-        for i, stage in enumerate(self.stages):
-            if i < len(self.stages) - 1:
-                seats = round(
-                    self.total_seats_for_user_events
-                    * (stage.weight / self.total_weight)
-                )
-            else:
-                seats = round(self.total_seats_for_user_events - running_allocated_sum)
-            stage.allocated_seats_original = seats
-            running_allocated_sum += seats
-
-        reduction_rate = 0.0
-        if self.duplicate_当選_config.get("type") == "seat_reduction":
-            reduction_rate = self.duplicate_当選_config.get("rate", 0.0)
-            if not (0.0 <= reduction_rate <= 1.0):
-                raise ValueError("座席減少率は0.0から1.0の間である必要があります。")
-        for stage in self.stages:
-            stage.effective_seats_for_new_winners = round(
-                stage.allocated_seats_original * (1 - reduction_rate)
-            )
+        table = self._compute_stage_invariants()
+        table.effective = _effective_seats(table.allocated, self._reduction_rate)
+        # 確率計算の結果は変更しないよう、座席の列のみを書き戻す
+        table.write_back_seats(self.stages)
 
     def calculate_probabilities(self) -> dict:
         """各選考ステージの当選確率を計算するメソッド
@@ -147,109 +476,160 @@ class LotterySimulator:
         各ステージの申込者数、当選者数、条件付き当選確率を計算し、
         最終的な当選確率の内訳を計算します。前のステージで当選した人は
         次のステージには申し込まないという前提で計算します。
+        ステージ定義と設定が同じ計算は、インスタンスをまたいで計算済みの結果を再利用します。
+        前回と同じステージで同じ計算結果が得られた場合は、テーブルの作り直しと
+        各ステージへの書き戻しを省略します。
 
         Returns:
             dict: 最終的な当選確率の内訳（各ステージでの当選確率と全選考で落選する確率）
+
+        Raises:
+            ValueError: ステージが追加されているが比重の合計が0の場合
         """
         if not self.stages:
             self.final_probabilities = {"全選考で落選": 1.0}
             return self.final_probabilities
 
-        self._allocate_seats_to_stages()
-        cumulative_new_winners = 0
-        prob_of_reaching_stage_unwon = 1.0
-        self.results_per_stage_raw = []
-        self.final_probabilities = {}
+        stage_params, total_weight = self._current_stage_params()
+        solution = _solve_stages(
+            stage_params,
+            total_weight,
+            self.total_seats_for_user_events,
+            self.core_fan_total_population,
+            self._reduction_rate,
+        )
+        # 前回と同じステージ（名前も含む）で同じ計算結果なら、書き戻し済みの結果をそのまま返す
+        names = [stage.name for stage in self.stages]
+        if (
+            solution is self._solution
+            and self.stage_table.names == names
+            and len(self.results_per_stage_raw) == len(self.stages)
+            and all(map(operator.is_, self.results_per_stage_raw, self.stages))
+        ):
+            return self.final_probabilities
 
-        for stage in self.stages:
-            potential_core_fan_applicants = round(
-                self.core_fan_total_population * stage.applicant_core_fan_ratio
-            )
-            stage.premise_applicants_for_stage_type = (
-                potential_core_fan_applicants + stage.additional_applicants
-            )
-            stage.actual_applicants_for_stage = max(
-                0, stage.premise_applicants_for_stage_type - cumulative_new_winners
-            )
+        # ステージが直接変更されていても一致するよう、テーブルは現在のステージから作り直す
+        table = StageTable.from_stages(self.stages)
+        self.stage_table = table
+        (
+            table.allocated,
+            table.effective,
+            table.premise,
+            table.actual,
+            table.winners,
+            table.cond_prob,
+        ) = solution[:6]
+        events = [f"{name}で当選" for name in table.names] + ["全選考で落選"]
+        self.final_probabilities = dict(zip(events, solution.final_probs))
 
-            if (
-                stage.actual_applicants_for_stage == 0
-                or stage.effective_seats_for_new_winners == 0
-            ):
-                stage.conditional_win_prob_in_stage = 0.0
-                stage.winners_in_stage = 0
-            else:
-                stage.winners_in_stage = min(
-                    stage.actual_applicants_for_stage,
-                    stage.effective_seats_for_new_winners,
-                )
-                stage.conditional_win_prob_in_stage = (
-                    stage.winners_in_stage / stage.actual_applicants_for_stage
-                )
-
-            prob_win_first_time_at_this_stage = (
-                prob_of_reaching_stage_unwon * stage.conditional_win_prob_in_stage
-            )
-            self.final_probabilities[f"{stage.name}で当選"] = (
-                prob_win_first_time_at_this_stage
-            )
-            prob_of_reaching_stage_unwon *= 1 - stage.conditional_win_prob_in_stage
-            cumulative_new_winners += stage.winners_in_stage
-            self.results_per_stage_raw.append(stage)
-        self.final_probabilities["全選考で落選"] = prob_of_reaching_stage_unwon
+        # 計算結果は最後にまとめて各ステージへ書き戻す
+        table.write_back(self.stages)
+        self._solution = solution
+        self.results_per_stage_raw = list(self.stages)
 
         return self.final_probabilities
 
-    def display_results(self, display_details: bool = False) -> None:
+    def sweep_reduction_rates(
+        self, reduction_rates: Sequence[float]
+    ) -> List[Dict[str, float]]:
+        """座席減少率だけが異なる複数ケースの最終的な当選確率を一括で計算するメソッド
+
+        座席配分と前提申込者数はステージから一度だけ計算し、全ケースの確率を
+        _sweep_final_probsの2次元のベクトル演算でまとめて求めます。
+        シミュレーター自身の重複当選の設定と計算結果（final_probabilitiesなど）は変更しません。
+
+        Args:
+            reduction_rates (Sequence[float]): 各ケースの座席減少率（0.0〜1.0）
+
+        Returns:
+            List[dict]: 各ケースの最終的な当選確率の内訳（calculate_probabilitiesと同じ形式）
+
+        Raises:
+            ValueError: ステージが追加されているが比重の合計が0の場合、または
+                       座席減少率が0.0から1.0の範囲外の場合
+        """
+        if not self.stages:
+            return [{"全選考で落選": 1.0} for _ in reduction_rates]
+
+        table = self._compute_stage_invariants()
+        final_probs = _sweep_final_probs(
+            table.allocated, table.premise, np.asarray(reduction_rates)
+        )
+        events = [f"{name}で当選" for name in table.names] + ["全選考で落選"]
+        return [dict(zip(events, row)) for row in final_probs.tolist()]
+
+    def display_results(
+        self, display_details: bool = False, *, writer: Callable[[str], None] = print
+    ) -> None:
         """シミュレーション結果を表示するメソッド
 
         計算された当選確率や各ステージの詳細情報をコンソールに表示します。
+        表示内容は1つの文字列にまとめてから、writerを一度だけ呼び出して出力します。
 
         Args:
             display_details (bool, optional): 各ステージの詳細情報を表示するかどうか。デフォルトはFalse
+            writer (Callable[[str], None], optional): 表示内容の出力先。デフォルトはprint
         """
-        print("\n--- 当選確率シミュレーション結果 ---")
-        print(
+        lines = ["\n--- 当選確率シミュレーション結果 ---"]
+        lines.append(
             f"ユーザーが申し込む公演の総当選枠（理論値）: {self.total_seats_for_user_events:.0f}席"
         )
-        if self.duplicate_当選_config.get("type") == "seat_reduction":
-            rate = self.duplicate_当選_config.get("rate", 0.0) * 100
-            print(
+        if self._is_seat_reduction:
+            rate = self._reduction_rate * 100
+            lines.append(
                 f"重複当選考慮: 新規当選者向け有効枠が各ステージで {rate:.1f}% 減少すると仮定"
             )
         else:
-            print("重複当選考慮: なし (または未設定)")
+            lines.append("重複当選考慮: なし (または未設定)")
 
         if display_details and self.results_per_stage_raw:
-            print("\n--- 各選考ステージ詳細 ---")
+            lines.append("\n--- 各選考ステージ詳細 ---")
             header = f"{'選考名':<12} | {'割当席(元)':>8} | {'有効席(新)':>8} | {'前提申込者':>10} | {'実質申込者':>10} | {'当選者数':>8} | {'条件付当選率':>10}"
-            print(header)
-            print("-" * len(header))
-            total_potential_seats_sum, total_effective_seats_sum, total_winners_sum = (
-                0,
-                0,
-                0,
-            )
-            for r in self.results_per_stage_raw:
-                print(
-                    f"{r.name:<12} | {r.allocated_seats_original:>8} | {r.effective_seats_for_new_winners:>8} | {r.premise_applicants_for_stage_type:>10} | {r.actual_applicants_for_stage:>10} | {r.winners_in_stage:>8} | {r.conditional_win_prob_in_stage*100:>9.2f}%"
+            lines.append(header)
+            lines.append("-" * len(header))
+            table = self.stage_table
+            for (
+                name,
+                allocated,
+                effective,
+                premise,
+                actual,
+                winners,
+                cond_prob,
+            ) in table.rows():
+                lines.append(
+                    f"{name:<12} | {allocated:>8} | {effective:>8} | {premise:>10} | {actual:>10} | {winners:>8} | {cond_prob*100:>9.2f}%"
                 )
-                total_potential_seats_sum += r.allocated_seats_original
-                total_effective_seats_sum += r.effective_seats_for_new_winners
-                total_winners_sum += r.winners_in_stage
-            print("-" * len(header))
-            print(
+            total_potential_seats_sum = int(table.allocated.sum())
+            total_effective_seats_sum = int(table.effective.sum())
+            total_winners_sum = int(table.winners.sum())
+            lines.append("-" * len(header))
+            lines.append(
                 f"{'合計':<12} | {total_potential_seats_sum:>8} | {total_effective_seats_sum:>8} | {'':>10} | {'':>10} | {total_winners_sum:>8} |"
             )
 
-        print("\n--- 最終的な当選確率の内訳 (全事象100%) ---")
-        if not self.final_probabilities:
-            print("計算結果がありません。")
-            return
-        for event, probability in self.final_probabilities.items():
-            print(f"{event}: {probability*100:.2f}%")
-        sum_probs_display = sum(self.final_probabilities.values()) * 100
-        print(
-            f"合計: {sum_probs_display:.2f}% (計算上の丸め誤差により100%からわずかにずれることがあります)"
-        )
-        print("------------------------------------")
+        lines.extend(format_final_probabilities(self.final_probabilities))
+        writer("\n".join(lines))
+
+
+def format_final_probabilities(final_probabilities: Dict[str, float]) -> List[str]:
+    """最終的な当選確率の内訳を表示用の行に整形する関数
+
+    Args:
+        final_probabilities (Dict[str, float]): 最終的な当選確率の内訳
+
+    Returns:
+        List[str]: 表示する行のリスト
+    """
+    lines = ["\n--- 最終的な当選確率の内訳 (全事象100%) ---"]
+    if not final_probabilities:
+        lines.append("計算結果がありません。")
+        return lines
+    for event, probability in final_probabilities.items():
+        lines.append(f"{event}: {probability*100:.2f}%")
+    sum_probs_display = sum(final_probabilities.values()) * 100
+    lines.append(
+        f"合計: {sum_probs_display:.2f}% (計算上の丸め誤差により100%からわずかにずれることがあります)"
+    )
+    lines.append("------------------------------------")
+    return lines
@@ -1,5 +1,81 @@
 """LotteryStageクラスの定義モジュール"""
 
+from typing import Iterable, NamedTuple, Tuple
+
+
+class FrozenStage(NamedTuple):
+    """検証済みの選考ステージ定義を保持する不変タプル。
+
+    設定ファイルから読み込んだステージ定義を一度だけ検証して保持し、
+    複数のシミュレーションケースで再検証せずに使い回すために使用します。
+
+    Attributes:
+        name (str): ステージの名前
+        applicant_core_fan_ratio (float): このステージで申し込むコアファンの割合（0.0〜1.0）
+        additional_applicants (int): コアファン以外の追加申込者数
+        weight (float): 座席配分の重み付け係数
+    """
+
+    name: str
+    applicant_core_fan_ratio: float
+    additional_applicants: int
+    weight: float
+
+
+FrozenStages = Tuple[FrozenStage, ...]
+
+
+def validate_stage_params(
+    name: str,
+    applicant_core_fan_ratio: float,
+    additional_applicants: int,
+    weight: float,
+) -> None:
+    """選考ステージのパラメータを検証する関数
+
+    Args:
+        name (str): ステージの名前
+        applicant_core_fan_ratio (float): このステージで申し込むコアファンの割合（0.0〜1.0）
+        additional_applicants (int): コアファン以外の追加申込者数
+        weight (float): 座席配分の重み付け係数
+
+    Raises:
+        ValueError: パラメータが不正な値の場合（申込割合が0-1の範囲外、追加申込者数が負、比重が0以下）
+    """
+    if not (0.0 <= applicant_core_fan_ratio <= 1.0):
+        raise ValueError(
+            f"ステージ「{name}」のコアファン申込割合は0.0から1.0の間である必要があります。"
+        )
+    if additional_applicants < 0:
+        raise ValueError(
+            f"ステージ「{name}」の追加申込者数は0以上である必要があります。"
+        )
+    if weight <= 0:
+        raise ValueError(
+            f"ステージ「{name}」の比重は0より大きい値である必要があります。"
+        )
+
+
+def freeze_stages(
+    stages_def: Iterable[Tuple[str, float, int, float]],
+) -> FrozenStages:
+    """選考ステージ定義を一度だけ検証し、不変のタプルに変換する関数
+
+    Args:
+        stages_def (Iterable[Tuple[str, float, int, float]]): 各選考ステージの定義
+            各要素は (name, applicant_core_fan_ratio, additional_applicants, weight) の形式
+
+    Returns:
+        FrozenStages: 検証済みのFrozenStageのタプル
+
+    Raises:
+        ValueError: いずれかのステージのパラメータが不正な値の場合
+    """
+    frozen_stages = tuple(FrozenStage(*stage_args) for stage_args in stages_def)
+    for stage in frozen_stages:
+        validate_stage_params(*stage)
+    return frozen_stages
+
 
 class LotteryStage:
     """各選考ステージの情報を保持するクラス。
@@ -20,6 +96,20 @@ class LotteryStage:
         conditional_win_prob_in_stage (float): このステージでの条件付き当選確率
     """
 
+    # 多数のシミュレーターを生成する場合に備え、インスタンスごとの__dict__を持たない
+    __slots__ = (
+        "name",
+        "applicant_core_fan_ratio",
+        "additional_applicants",
+        "weight",
+        "allocated_seats_original",
+        "effective_seats_for_new_winners",
+        "premise_applicants_for_stage_type",
+        "actual_applicants_for_stage",
+        "winners_in_stage",
+        "conditional_win_prob_in_stage",
+    )
+
     def __init__(
         self,
         name: str,
@@ -0,0 +1,129 @@
+"""StageTableクラスの定義モジュール"""
+
+from dataclasses import dataclass, field
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from .lottery_stage import LotteryStage
+
+
+@dataclass
+class StageTable:
+    """全選考ステージの情報を列ごとの配列として保持するクラス。
+
+    LotteryStageのようにステージごとにオブジェクトを持つ代わりに、各属性を
+    ステージ数と同じ長さのNumPy配列として保持します（Structure of Arrays）。
+    席数・人数はint64、比率・確率はfloat64の配列です。
+    シミュレーション計算はこの配列に対するベクトル演算で行います。
+
+    Attributes:
+        names (list): 各ステージの名前
+        weight (np.ndarray): 座席配分の重み付け係数
+        ratio (np.ndarray): コアファンの申込割合（0.0〜1.0）
+        additional (np.ndarray): コアファン以外の追加申込者数
+        allocated (np.ndarray): 割り当てられた席数（元の計算値）
+        effective (np.ndarray): 新規当選者向けの有効席数（重複当選考慮後）
+        premise (np.ndarray): 前提となる申込者数（理論値）
+        actual (np.ndarray): 実際の申込者数（前ステージでの当選者を除く）
+        winners (np.ndarray): 当選者数
+        cond_prob (np.ndarray): 条件付き当選確率
+    """
+
+    names: List[str]
+    weight: np.ndarray
+    ratio: np.ndarray
+    additional: np.ndarray
+    allocated: np.ndarray = field(init=False)
+    effective: np.ndarray = field(init=False)
+    premise: np.ndarray = field(init=False)
+    actual: np.ndarray = field(init=False)
+    winners: np.ndarray = field(init=False)
+    cond_prob: np.ndarray = field(init=False)
+
+    def __post_init__(self) -> None:
+        """計算結果を格納する配列をステージ数に合わせて確保する"""
+        size = len(self.names)
+        self.allocated = np.zeros(size, dtype=np.int64)
+        self.effective = np.zeros(size, dtype=np.int64)
+        self.premise = np.zeros(size, dtype=np.int64)
+        self.actual = np.zeros(size, dtype=np.int64)
+        self.winners = np.zeros(size, dtype=np.int64)
+        self.cond_prob = np.zeros(size, dtype=np.float64)
+
+    @classmethod
+    def from_stages(cls, stages: Sequence[LotteryStage]) -> "StageTable":
+        """LotteryStageのリストからStageTableを生成するクラスメソッド
+
+        Args:
+            stages (Sequence[LotteryStage]): 選考ステージのリスト
+
+        Returns:
+            StageTable: 各ステージの入力パラメータを配列化したテーブル
+        """
+        return cls(
+            names=[stage.name for stage in stages],
+            weight=np.array([stage.weight for stage in stages], dtype=np.float64),
+            ratio=np.array(
+                [stage.applicant_core_fan_ratio for stage in stages], dtype=np.float64
+            ),
+            additional=np.array(
+                [stage.additional_applicants for stage in stages], dtype=np.int64
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def rows(self) -> Iterator[Tuple[str, int, int, int, int, int, float]]:
+        """表示用に各ステージの計算結果を1行ずつ返すメソッド
+
+        Returns:
+            Iterator[tuple]: (名前, 割当席, 有効席, 前提申込者, 実質申込者, 当選者数, 条件付当選率)
+        """
+        return zip(
+            self.names,
+            self.allocated.tolist(),
+            self.effective.tolist(),
+            self.premise.tolist(),
+            self.actual.tolist(),
+            self.winners.tolist(),
+            self.cond_prob.tolist(),
+        )
+
+    def write_back_seats(self, stages: Sequence[LotteryStage]) -> None:
+        """座席配分の計算結果だけをLotteryStageへ書き戻すメソッド
+
+        割り当て席数と有効席数のみを更新し、申込者数や当選者数などの
+        確率計算の結果は変更しません。
+
+        Args:
+            stages (Sequence[LotteryStage]): 書き戻し先の選考ステージのリスト
+        """
+        for stage, allocated, effective in zip(
+            stages, self.allocated.tolist(), self.effective.tolist()
+        ):
+            stage.allocated_seats_original = allocated
+            stage.effective_seats_for_new_winners = effective
+
+    def write_back(self, stages: Sequence[LotteryStage]) -> None:
+        """計算結果をLotteryStageの各属性へまとめて書き戻すメソッド
+
+        Args:
+            stages (Sequence[LotteryStage]): 書き戻し先の選考ステージのリスト
+        """
+        for stage, allocated, effective, premise, actual, winners, cond_prob in zip(
+            stages,
+            self.allocated.tolist(),
+            self.effective.tolist(),
+            self.premise.tolist(),
+            self.actual.tolist(),
+            self.winners.tolist(),
+            self.cond_prob.tolist(),
+        ):
+            stage.allocated_seats_original = allocated
+            stage.effective_seats_for_new_winners = effective
+            stage.premise_applicants_for_stage_type = premise
+            stage.actual_applicants_for_stage = actual
+            stage.winners_in_stage = winners
+            stage.conditional_win_prob_in_stage = cond_prob
@@ -1,9 +1,48 @@
 """設定ファイル読み込み関連のモジュール"""
 
+import functools
 import json
+from typing import Callable
 
+try:
+    import orjson
+except ImportError:  # orjsonが無い環境では標準ライブラリのjsonでパースする
+    orjson = None
 
-def load_config(config_path: str = "config/config.json") -> dict:
+
+def _read_config(config_path: str) -> dict:
+    """設定ファイルを読み込んでパースする内部関数
+
+    Args:
+        config_path (str): 設定ファイルのパス
+
+    Returns:
+        dict: 設定内容を含む辞書
+    """
+    with open(config_path, "rb") as f:
+        data = f.read()
+    # orjson.JSONDecodeErrorはjson.JSONDecodeErrorのサブクラスのため、
+    # どちらでパースしても呼び出し側で同じ例外として扱える
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# 例外はキャッシュされないため、読み込みに成功した設定のみ再利用される
+_read_config_cached = functools.lru_cache(maxsize=16)(_read_config)
+
+
+def clear_config_cache() -> None:
+    """load_config(use_cache=True)でキャッシュした設定を破棄する関数"""
+    _read_config_cached.cache_clear()
+
+
+def load_config(
+    config_path: str = "config/config.json",
+    use_cache: bool = False,
+    *,
+    writer: Callable[[str], None] = print,
+) -> dict:
     """設定ファイルを読み込む関数
 
     指定されたJSONファイルを読み込み、シミュレーションの設定を取得します。
@@ -12,23 +51,31 @@ def load_config(config_path: str = "config/config.json") -> dict:
 
     Args:
         config_path (str, optional): 設定ファイルのパス。デフォルトは"config.json"
+        use_cache (bool, optional): Trueの場合、同じパスの設定は2回目以降ファイルを
+            再読み込みせずキャッシュを返す。返される辞書はキャッシュと共有されるため
+            変更しないこと。デフォルトはFalse
+        writer (Callable[[str], None], optional): メッセージの出力先。デフォルトはprint
 
     Returns:
         dict or None: 設定内容を含む辞書。エラーが発生した場合はNone
     """
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            config = json.load(f)
-        print(f"設定ファイル '{config_path}' を読み込みました")
+        if use_cache:
+            config = _read_config_cached(config_path)
+        else:
+            config = _read_config(config_path)
+        writer(f"設定ファイル '{config_path}' を読み込みました")
         return config
     except FileNotFoundError:
-        print(f"エラー: 設定ファイル '{config_path}' が見つかりません")
+        writer(f"エラー: 設定ファイル '{config_path}' が見つかりません")
         return {}
     except json.JSONDecodeError as e:
-        print(f"エラー: 設定ファイル '{config_path}' のJSONフォーマットが不正です: {e}")
+        writer(
+            f"エラー: 設定ファイル '{config_path}' のJSONフォーマットが不正です: {e}"
+        )
         return {}
     except Exception as e:
-        print(
+        writer(
             f"エラー: 設定ファイル '{config_path}' の読み込み中に問題が発生しました: {e}"
         )
         return {}
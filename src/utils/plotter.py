@@ -1,7 +1,16 @@
 """グラフ描画関連のモジュール"""
 
+import functools
+import os
 import re
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+import matplotlib
+
+# 環境変数LIVETICKET_HEADLESSが設定されている場合は、GUIを使わない非対話バックエンドで描画する
+if os.environ.get("LIVETICKET_HEADLESS"):
+    matplotlib.use("Agg")
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -22,11 +31,101 @@ except Exception:
         "日本語フォントの設定に失敗しました。グラフの日本語が文字化けする可能性があります。"
     )
 
+_STAGE_NUMBER_PATTERN = re.compile(r"(\d+)次")
+
+
+@functools.lru_cache(maxsize=256)
+def _get_sort_key(key_str: str) -> Tuple[int, int, str]:
+    """ステージのキーを「N次」の番号順、落選を最後に並べるためのソートキーを返す関数"""
+    match = _STAGE_NUMBER_PATTERN.match(key_str)
+    if match:
+        return (0, int(match.group(1)), key_str)
+    if "落選" in key_str or "全滅" in key_str:  # "全滅"も考慮
+        return (1, 0, key_str)
+    return (2, 0, key_str)
+
+
+@functools.lru_cache(maxsize=32)
+def _sort_stage_keys(stage_keys: FrozenSet[str]) -> Tuple[str, ...]:
+    """ステージのキーの集合を表示順に並べる関数。同じキー構成の結果では並び順を再利用する"""
+    return tuple(sorted(stage_keys, key=_get_sort_key))
+
+
+# (id(stage_name_map), キーの集合) -> (stage_name_map, 並び順のキー, 表示名)
+# idの再利用で別のマッピングと取り違えないよう、マッピング自体も保持して照合する
+_stage_layout_cache: Dict[
+    Tuple[int, FrozenSet[str]],
+    Tuple[Optional[Mapping[str, str]], Tuple[str, ...], Tuple[str, ...]],
+] = {}
+_STAGE_LAYOUT_CACHE_SIZE = 32
+
+
+def _get_stage_layout(
+    stage_keys: FrozenSet[str], stage_name_map: Optional[Mapping[str, str]]
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """ステージのキーの並び順と、それに対応するグラフ表示名を返す関数
+
+    stage_name_mapがNoneまたは変更不可のMappingProxyTypeの場合は、結果をキャッシュして
+    同じマッピング・同じキー構成での呼び出し時に再利用します。
+
+    Args:
+        stage_keys (frozenset of str): 全ケースの結果に含まれるステージのキー
+        stage_name_map (Mapping, optional): final_probabilitiesのキーとグラフ表示名のマッピング
+
+    Returns:
+        Tuple[tuple, tuple]: (並び順のキー, 表示名)
+    """
+    cacheable = stage_name_map is None or isinstance(stage_name_map, MappingProxyType)
+    cache_key = (id(stage_name_map), stage_keys)
+    if cacheable:
+        cached = _stage_layout_cache.get(cache_key)
+        if cached is not None and cached[0] is stage_name_map:
+            return cached[1], cached[2]
+
+    sorted_keys = _sort_stage_keys(stage_keys)
+    if stage_name_map:
+        display_names = tuple(
+            stage_name_map.get(k, k.replace("で当選", "")) for k in sorted_keys
+        )
+    else:
+        display_names = tuple(k.replace("で当選", "") for k in sorted_keys)
+
+    if cacheable:
+        if len(_stage_layout_cache) >= _STAGE_LAYOUT_CACHE_SIZE:
+            _stage_layout_cache.clear()
+        _stage_layout_cache[cache_key] = (stage_name_map, sorted_keys, display_names)
+    return sorted_keys, display_names
+
+
+def _build_probability_matrix(
+    results_list: List[Dict[str, float]], stage_keys: List[str]
+) -> np.ndarray:
+    """各ケースの結果辞書を、ケース×ステージの確率行列(%)に変換する関数
+
+    Args:
+        results_list (list of dict): 各ケースのfinal_probabilities辞書のリスト
+        stage_keys (list of str): 列の並び順となるステージのキーのリスト
+
+    Returns:
+        np.ndarray: 形状 (ケース数, ステージ数) の確率(%)の行列。結果に無いステージは0
+    """
+    probabilities = np.array(
+        [
+            [case_results.get(key, 0.0) for key in stage_keys]
+            for case_results in results_list
+        ],
+        dtype=np.float64,
+    )
+    return probabilities.reshape(len(results_list), len(stage_keys)) * 100
+
 
 def plot_probability_comparison(
     results_list: List[Dict[str, float]],
     case_names_list: List[str],
-    stage_name_map: Optional[Dict[str, str]] = None,
+    stage_name_map: Optional[Mapping[str, str]] = None,
+    savepath: Optional[str] = None,
+    *,
+    writer: Callable[[str], None] = print,
 ) -> None:
     """複数のシミュレーション結果を積み上げ横棒グラフで比較して表示する。
 
@@ -38,18 +137,21 @@ def plot_probability_comparison(
             各辞書は {"ステージ名で当選": float, ...} の形式。
         case_names_list (list of str): 各ケースの名前のリスト。
             例: ["重複当選なし", "重複当選あり (新規枠10%減)"]
-        stage_name_map (dict, optional): final_probabilitiesのキーとグラフ表示名のマッピング。
+        stage_name_map (Mapping, optional): final_probabilitiesのキーとグラフ表示名のマッピング。
             例: {"1次(CD+年会員)で当選": "1次", "全選考で落選": "全滅"}
+            MappingProxyTypeで渡すと、キーの並び順と表示名の計算結果が呼び出し間で再利用される。
+        savepath (str, optional): 指定した場合はグラフを表示せず、このパスに画像として保存する。
+        writer (Callable[[str], None], optional): メッセージの出力先。デフォルトはprint
 
     Returns:
-        None: グラフを表示するのみで、戻り値はありません。
+        None: グラフを表示または保存するのみで、戻り値はありません。
     """
     if (
         not results_list
         or not case_names_list
         or len(results_list) != len(case_names_list)
     ):
-        print("描画データまたはケース名が不適切です。")
+        writer("描画データまたはケース名が不適切です。")
         return
 
     # 1. Collect all unique stage keys from all results
@@ -57,31 +159,14 @@ def plot_probability_comparison(
     for res_dict in results_list:
         all_stage_keys_set.update(res_dict.keys())
 
-    def get_sort_key(key_str: str) -> Tuple[int, int, str]:
-        match = re.match(r"(\d+)次", key_str)
-        if match:
-            return (0, int(match.group(1)), key_str)
-        if "落選" in key_str or "全滅" in key_str:  # "全滅"も考慮
-            return (1, 0, key_str)
-        return (2, 0, key_str)
-
-    # 2. Sort these globally collected keys
-    globally_sorted_internal_keys = sorted(list(all_stage_keys_set), key=get_sort_key)
-
+    # 2. Sort these globally collected keys and
     # 3. Generate display names based on these global keys
-    if stage_name_map:
-        globally_display_names_ordered = [
-            stage_name_map.get(k, k.replace("で当選", ""))
-            for k in globally_sorted_internal_keys
-        ]
-    else:
-        globally_display_names_ordered = [
-            k.replace("で当選", "") for k in globally_sorted_internal_keys
-        ]
+    sorted_keys, display_names = _get_stage_layout(
+        frozenset(all_stage_keys_set), stage_name_map
+    )
+    globally_sorted_internal_keys = list(sorted_keys)
+    globally_display_names_ordered = list(display_names)
 
-    # This variable is not strictly necessary for the plot dimensions anymore,
-    # but represents the total number of unique stages.
-    num_unique_stages = len(globally_sorted_internal_keys)
     num_cases = len(case_names_list)
     y_positions = np.arange(num_cases)
     bar_height = 0.6  # 各積み上げ棒の高さ
@@ -100,37 +185,49 @@ def plot_probability_comparison(
         )  # Use global keys for consistent coloring
     }
 
-    for i, case_name in enumerate(case_names_list):
-        case_results = results_list[i]
-        left_offset = 0
-        for stage_idx, stage_key in enumerate(globally_sorted_internal_keys):
-            probability = case_results.get(stage_key, 0) * 100
-            display_name_for_legend = globally_display_names_ordered[stage_idx]
-
-            if probability > 0:  # 確率が0より大きい場合のみ描画
-                ax.barh(
-                    y_positions[i],
-                    probability,
-                    height=bar_height,
-                    left=left_offset,
-                    color=stage_colors[stage_key],
-                    label=display_name_for_legend,  # Always pass the label
-                    edgecolor="white",
-                )
-                # セグメント内にテキスト表示 (任意、見づらい場合は調整または削除)
-                if probability > 3:  # 小さすぎるセグメントにはテキストを表示しない
-                    ax.text(
-                        left_offset + probability / 2,
-                        y_positions[i],
-                        f"{probability:.1f}%",
-                        ha="center",
-                        va="center",
-                        color=(
-                            "white" if probability > 10 else "black"
-                        ),  # 背景色に応じて文字色変更
-                        fontsize=7,
-                    )
-            left_offset += probability
+    # ケース×ステージの確率行列(%)と、各セグメントの左端位置（それより前のステージの累積値）
+    probabilities = _build_probability_matrix(
+        results_list, globally_sorted_internal_keys
+    )
+    left_offsets = np.zeros_like(probabilities)
+    left_offsets[:, 1:] = np.cumsum(probabilities, axis=1)[:, :-1]
+
+    # ステージごとに全ケース分のセグメントを1回のbarhでまとめて描画する
+    for stage_idx, stage_key in enumerate(globally_sorted_internal_keys):
+        stage_probabilities = probabilities[:, stage_idx]
+        stage_left_offsets = left_offsets[:, stage_idx]
+        visible = stage_probabilities > 0  # 確率が0より大きい場合のみ描画
+        if not visible.any():
+            continue
+        visible_probabilities = stage_probabilities[visible]
+        container = ax.barh(
+            y_positions[visible],
+            visible_probabilities,
+            height=bar_height,
+            left=stage_left_offsets[visible],
+            color=stage_colors[stage_key],
+            label=globally_display_names_ordered[stage_idx],
+            edgecolor="white",
+        )
+        # セグメント内にテキスト表示 (任意、見づらい場合は調整または削除)
+        # 小さすぎるセグメントにはテキストを表示せず、背景色に応じて文字色を変える
+        # 文字色ごとにbar_labelを呼び、セグメントごとの色設定は行わない
+        for color, show_label in (
+            ("white", visible_probabilities > 10),
+            ("black", (visible_probabilities > 3) & (visible_probabilities <= 10)),
+        ):
+            if not show_label.any():
+                continue
+            ax.bar_label(
+                container,
+                labels=[
+                    f"{probability:.1f}%" if show else ""
+                    for probability, show in zip(visible_probabilities, show_label)
+                ],
+                label_type="center",
+                fontsize=7,
+                color=color,
+            )
 
     ax.set_xlabel("確率 (%)", fontsize=12)
     ax.set_ylabel("シミュレーションケース", fontsize=12)
@@ -155,4 +252,8 @@ def plot_probability_comparison(
 
     ax.grid(axis="y", linestyle="--", alpha=0.7)
     fig.tight_layout(rect=[0, 0, 0.85, 1])  # 凡例スペースを考慮
-    plt.show()
+    if savepath:
+        fig.savefig(savepath, dpi=100)
+    else:
+        plt.show()
+    plt.close(fig)  # 繰り返し描画する場合に図のメモリを解放する
@@ -1 +1,8 @@
 # tests package
+
+# テスト中は画面表示を行わないため、非対話型のAggバックエンドを選択し、
+# 重いmatplotlib.pyplotのインポートをテストモジュールの読み込み前に一度だけ行う
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot  # noqa: E402,F401
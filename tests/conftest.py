@@ -0,0 +1,18 @@
+"""テスト全体で共有するpytestのフィクスチャ"""
+
+import pytest
+
+from src.lottery.lottery_simulator import LotterySimulator
+from tests.helpers import BASE_SIMULATOR_ARGS, clone_simulator
+
+
+@pytest.fixture(scope="module")
+def base_simulator():
+    """状態を変更しないテスト向けに、モジュールごとに一度だけ構築するシミュレーター"""
+    return LotterySimulator(*BASE_SIMULATOR_ARGS)
+
+
+@pytest.fixture
+def simulator(base_simulator):
+    """状態を変更するテスト向けに、基準のシミュレーターをclone_simulatorで複製したシミュレーター"""
+    return clone_simulator(base_simulator)
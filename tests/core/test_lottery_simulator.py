@@ -1,191 +1,557 @@
 """LotterySimulatorクラスのテストモジュール"""
 
-import unittest
-from unittest.mock import patch
-
-from src.lottery.lottery_simulator import LotterySimulator
-
-
-class TestLotterySimulator(unittest.TestCase):
-    """LotterySimulatorクラスのテスト"""
-
-    def setUp(self):
-        """各テスト前の共通セットアップ"""
-        self.total_attendance = 100000
-        self.num_events = 10
-        self.target_events = {"tokyo": 2, "osaka": 1}
-        self.core_fan_population = 50000
-        self.simulator = LotterySimulator(
-            self.total_attendance,
-            self.num_events,
-            self.target_events,
-            self.core_fan_population,
-        )
+import numpy as np
+import pytest
 
-    def test_init(self):
-        """LotterySimulatorの初期化が正しく行われるかテスト"""
-        self.assertEqual(self.simulator.total_overall_attendance, self.total_attendance)
-        self.assertEqual(self.simulator.num_total_events, self.num_events)
-        self.assertEqual(self.simulator.user_target_events_details, self.target_events)
-        self.assertEqual(
-            self.simulator.core_fan_total_population, self.core_fan_population
-        )
-        self.assertEqual(self.simulator.duplicate_当選_config, {})
-        self.assertEqual(
-            self.simulator.seats_per_event, self.total_attendance / self.num_events
-        )
-        self.assertEqual(self.simulator.user_total_target_events, 3)
-        self.assertEqual(
-            self.simulator.total_seats_for_user_events,
-            (self.total_attendance / self.num_events) * 3,
-        )
-        self.assertEqual(self.simulator.stages, [])
-        self.assertEqual(self.simulator.results_per_stage_raw, [])
-        self.assertEqual(self.simulator.final_probabilities, {})
-        self.assertEqual(self.simulator.total_weight, 0)
-
-    def test_init_with_invalid_params(self):
-        """不正なパラメータでの初期化時に例外が発生するかテスト"""
-        with self.assertRaises(ValueError):
-            LotterySimulator(
-                self.total_attendance, 0, self.target_events, self.core_fan_population
-            )
-        with self.assertRaises(ValueError):
-            LotterySimulator(
-                self.total_attendance, self.num_events, {}, self.core_fan_population
-            )
-
-    def test_add_stage(self):
-        """ステージの追加が正しく行われるかテスト"""
-        self.simulator.add_stage("テスト1", 0.3, 1000, 5)
-        self.assertEqual(len(self.simulator.stages), 1)
-        self.assertEqual(self.simulator.stages[0].name, "テスト1")
-        self.assertEqual(self.simulator.total_weight, 5)
-        self.simulator.add_stage("テスト2", 0.5, 2000, 3)
-        self.assertEqual(len(self.simulator.stages), 2)
-        self.assertEqual(self.simulator.stages[1].name, "テスト2")
-        self.assertEqual(self.simulator.total_weight, 8)
-
-    def test_add_stage_with_invalid_params(self):
-        """不正なパラメータでのステージ追加時に例外が発生するかテスト"""
-        with self.assertRaises(ValueError):
-            self.simulator.add_stage("テスト", 1.5, 1000, 5)
-        with self.assertRaises(ValueError):
-            self.simulator.add_stage("テスト", -0.1, 1000, 5)
-        with self.assertRaises(ValueError):
-            self.simulator.add_stage("テスト", 0.5, -100, 5)
-        with self.assertRaises(ValueError):
-            self.simulator.add_stage("テスト", 0.5, 1000, 0)
-
-    def test_allocate_seats_to_stages(self):
-        """座席配分が正しく行われるかテスト"""
-        self.simulator.add_stage("テスト1", 0.3, 1000, 5)
-        self.simulator.add_stage("テスト2", 0.5, 2000, 3)
-        self.simulator.add_stage("テスト3", 0.7, 3000, 2)
-        self.simulator._allocate_seats_to_stages()
-        total_seats = self.simulator.total_seats_for_user_events
-        total_weight = 10
-        self.assertEqual(
-            self.simulator.stages[0].allocated_seats_original,
-            round(total_seats * (5 / total_weight)),
-        )
-        self.assertEqual(
-            self.simulator.stages[1].allocated_seats_original,
-            round(total_seats * (3 / total_weight)),
-        )
-        sum_allocated = sum(
-            stage.allocated_seats_original for stage in self.simulator.stages
-        )
-        self.assertEqual(sum_allocated, round(total_seats))
-        for stage in self.simulator.stages:
-            self.assertEqual(
-                stage.effective_seats_for_new_winners, stage.allocated_seats_original
-            )
-
-    def test_allocate_seats_with_duplicate_config(self):
-        """重複当選設定がある場合の座席配分テスト"""
-        simulator = LotterySimulator(
-            self.total_attendance,
-            self.num_events,
-            self.target_events,
-            self.core_fan_population,
-            {"type": "seat_reduction", "rate": 0.2},
+from src.lottery.lottery_simulator import (
+    LotterySimulator,
+    _compute_stage_probs,
+    _solve_invariants,
+    _solve_stages,
+)
+from src.lottery.lottery_stage import freeze_stages
+from tests.helpers import BASE_SIMULATOR_ARGS, clone_simulator
+
+TOTAL_ATTENDANCE, NUM_EVENTS, TARGET_EVENTS, CORE_FAN_POPULATION = BASE_SIMULATOR_ARGS
+
+_TWO_STAGES = (("ステージ1", 0.5, 0, 1), ("ステージ2", 1.0, 0, 1))
+
+# (ケース名, 重複当選の設定, ステージ定義, 期待する最終的な当選確率)
+# いずれも総座席数1000、コアファン1000人のシミュレーターで計算する
+_CALCULATE_PROBABILITIES_CASES = (
+    ("ステージなし", {}, (), {"全選考で落選": 1.0}),
+    (
+        "重複当選なし",
+        {},
+        _TWO_STAGES,
+        {
+            # ステージ1: 席500, 申込500 -> 当選率100%
+            "ステージ1で当選": 1.0,
+            # ステージ1で全員当選するため、ステージ2の実質申込者は0
+            "ステージ2で当選": 0.0,
+            "全選考で落選": 0.0,
+        },
+    ),
+    (
+        "重複当選あり",
+        {"type": "seat_reduction", "rate": 0.2},
+        _TWO_STAGES,
+        {
+            # ステージ1: 席500*0.8=400, 申込500 -> 条件付当選率0.8
+            "ステージ1で当選": 0.8,
+            # ステージ2: 席400, 実質申込者(1000-400)=600 -> (1.0-0.8)*(400/600)
+            "ステージ2で当選": 0.1333,
+            # 全選考で落選: (1.0-0.8)*(1-400/600)
+            "全選考で落選": 0.0666,
+        },
+    ),
+)
+
+
+@pytest.fixture(scope="module")
+def probability_base():
+    """確率計算のテストで複製して使う、総座席数1000・コアファン1000人の骨組み"""
+    return LotterySimulator(10000, 10, {"test": 1}, 1000)
+
+
+def test_init(base_simulator):
+    """LotterySimulatorの初期化が正しく行われるかテスト"""
+    assert base_simulator.total_overall_attendance == TOTAL_ATTENDANCE
+    assert base_simulator.num_total_events == NUM_EVENTS
+    assert base_simulator.user_target_events_details == TARGET_EVENTS
+    assert base_simulator.core_fan_total_population == CORE_FAN_POPULATION
+    assert base_simulator.duplicate_当選_config == {}
+    assert base_simulator.seats_per_event == TOTAL_ATTENDANCE / NUM_EVENTS
+    assert base_simulator.user_total_target_events == 3
+    assert base_simulator.total_seats_for_user_events == (
+        (TOTAL_ATTENDANCE / NUM_EVENTS) * 3
+    )
+    assert base_simulator.stages == []
+    assert base_simulator.stage_table is None
+    assert base_simulator.results_per_stage_raw == []
+    assert base_simulator.final_probabilities == {}
+    assert base_simulator.total_weight == 0
+
+
+def test_init_with_invalid_params():
+    """不正なパラメータでの初期化時に例外が発生するかテスト"""
+    with pytest.raises(ValueError):
+        LotterySimulator(TOTAL_ATTENDANCE, 0, TARGET_EVENTS, CORE_FAN_POPULATION)
+    with pytest.raises(ValueError):
+        LotterySimulator(TOTAL_ATTENDANCE, NUM_EVENTS, {}, CORE_FAN_POPULATION)
+
+
+def test_init_with_invalid_reduction_rate():
+    """座席減少率が範囲外の場合に初期化時に例外が発生するかテスト"""
+    with pytest.raises(ValueError):
+        LotterySimulator(*BASE_SIMULATOR_ARGS, {"type": "seat_reduction", "rate": 1.5})
+    # 座席減少以外の設定ではrateは使われないため検証しない
+    simulator = LotterySimulator(*BASE_SIMULATOR_ARGS, {"type": "other", "rate": 1.5})
+    assert simulator._reduction_rate == 0.0
+
+
+def test_set_duplicate_config(simulator):
+    """重複当選設定の更新時に座席減少率が再計算されるかテスト"""
+    simulator.duplicate_当選_config = {"type": "seat_reduction", "rate": 0.25}
+    assert simulator._reduction_rate == 0.25
+    simulator.duplicate_当選_config = None
+    assert simulator.duplicate_当選_config == {}
+    assert simulator._reduction_rate == 0.0
+    with pytest.raises(ValueError):
+        simulator.duplicate_当選_config = {"type": "seat_reduction", "rate": -0.1}
+
+
+def test_duplicate_config_is_read_only(simulator):
+    """重複当選設定はその場で変更できず、元の辞書の変更も反映されないかテスト"""
+    config = {"type": "seat_reduction", "rate": 0.25}
+    simulator.duplicate_当選_config = config
+    with pytest.raises(TypeError):
+        simulator.duplicate_当選_config["rate"] = 0.3
+    config["rate"] = 0.3
+    assert simulator.duplicate_当選_config["rate"] == 0.25
+    assert simulator._reduction_rate == 0.25
+
+
+def test_add_stage(simulator, base_simulator):
+    """ステージの追加が正しく行われるかテスト"""
+    simulator.add_stage("テスト1", 0.3, 1000, 5)
+    assert len(simulator.stages) == 1
+    assert simulator.stages[0].name == "テスト1"
+    assert simulator.total_weight == 5
+    simulator.add_stage("テスト2", 0.5, 2000, 3)
+    assert len(simulator.stages) == 2
+    assert simulator.stages[1].name == "テスト2"
+    assert simulator.total_weight == 8
+    # 複製元のシミュレーターは変更されない
+    assert base_simulator.stages == []
+    assert base_simulator.total_weight == 0
+
+
+def test_add_stage_with_invalid_params(simulator):
+    """不正なパラメータでのステージ追加時に例外が発生するかテスト"""
+    with pytest.raises(ValueError):
+        simulator.add_stage("テスト", 1.5, 1000, 5)
+    with pytest.raises(ValueError):
+        simulator.add_stage("テスト", -0.1, 1000, 5)
+    with pytest.raises(ValueError):
+        simulator.add_stage("テスト", 0.5, -100, 5)
+    with pytest.raises(ValueError):
+        simulator.add_stage("テスト", 0.5, 1000, 0)
+
+
+def test_set_stages(simulator):
+    """検証済みステージ定義による一括設定が正しく行われるかテスト"""
+    simulator.add_stage("既存", 0.1, 0, 1)
+    frozen_stages = freeze_stages(
+        [("テスト1", 0.3, 1000, 5), ("テスト2", 0.5, 2000, 3)]
+    )
+    simulator.set_stages(frozen_stages)
+    assert len(simulator.stages) == 2
+    assert simulator.stages[0].name == "テスト1"
+    assert simulator.stages[1].additional_applicants == 2000
+    assert simulator.total_weight == 8
+
+
+def test_set_stages_matches_add_stage():
+    """一括設定とadd_stageで同じ計算結果になるかテスト"""
+    simulator = LotterySimulator(
+        10000, 10, {"test": 1}, 1000, {"type": "seat_reduction", "rate": 0.2}
+    )
+    for stage_args in _TWO_STAGES:
+        simulator.add_stage(*stage_args)
+    expected = simulator.calculate_probabilities()
+
+    simulator.set_stages(freeze_stages(_TWO_STAGES))
+    assert simulator.calculate_probabilities() == expected
+
+
+def test_allocate_seats_to_stages(simulator):
+    """座席配分が正しく行われるかテスト"""
+    simulator.add_stage("テスト1", 0.3, 1000, 5)
+    simulator.add_stage("テスト2", 0.5, 2000, 3)
+    simulator.add_stage("テスト3", 0.7, 3000, 2)
+    simulator._allocate_seats_to_stages()
+    total_seats = simulator.total_seats_for_user_events
+    total_weight = 10
+    assert simulator.stages[0].allocated_seats_original == round(
+        total_seats * (5 / total_weight)
+    )
+    assert simulator.stages[1].allocated_seats_original == round(
+        total_seats * (3 / total_weight)
+    )
+    sum_allocated = sum(stage.allocated_seats_original for stage in simulator.stages)
+    assert sum_allocated == round(total_seats)
+    for stage in simulator.stages:
+        assert stage.effective_seats_for_new_winners == stage.allocated_seats_original
+
+
+def test_allocate_seats_keeps_calculated_results():
+    """確率計算後に座席を再配分しても、各ステージの当選者数が保たれるかテスト"""
+    simulator = LotterySimulator(
+        10000, 10, {"test": 1}, 1000, {"type": "seat_reduction", "rate": 0.2}
+    )
+    for stage_args in _TWO_STAGES:
+        simulator.add_stage(*stage_args)
+    simulator.calculate_probabilities()
+    simulator._allocate_seats_to_stages()
+    assert simulator.stages[0].winners_in_stage == 400
+    assert simulator.stages[1].actual_applicants_for_stage == 600
+    assert simulator.stages[0].effective_seats_for_new_winners == 400
+
+
+def test_allocate_seats_residual_matches_rounded_total():
+    """総座席数の端数が0.5の場合も配分合計が四捨五入後の総座席数と一致するかテスト"""
+    simulator = LotterySimulator(5, 2, {"test": 1}, 1000)  # 総座席数 2.5
+    simulator.add_stage("テスト1", 0.5, 0, 1)
+    simulator.add_stage("テスト2", 0.5, 0, 1)
+    simulator._allocate_seats_to_stages()
+    total_seats = round(simulator.total_seats_for_user_events)
+    allocated = [stage.allocated_seats_original for stage in simulator.stages]
+    assert sum(allocated) == total_seats
+    assert allocated == [1, 1]
+    for stage in simulator.stages:
+        assert isinstance(stage.allocated_seats_original, int)
+
+
+def test_allocate_seats_with_duplicate_config(simulator):
+    """重複当選設定がある場合の座席配分テスト"""
+    simulator.duplicate_当選_config = {"type": "seat_reduction", "rate": 0.2}
+    simulator.add_stage("テスト1", 0.3, 1000, 5)
+    simulator.add_stage("テスト2", 0.5, 2000, 3)
+    simulator._allocate_seats_to_stages()
+    for stage in simulator.stages:
+        assert stage.effective_seats_for_new_winners == round(
+            stage.allocated_seats_original * 0.8
         )
-        simulator.add_stage("テスト1", 0.3, 1000, 5)
-        simulator.add_stage("テスト2", 0.5, 2000, 3)
-        simulator._allocate_seats_to_stages()
-        for stage in simulator.stages:
-            self.assertEqual(
-                stage.effective_seats_for_new_winners,
-                round(stage.allocated_seats_original * 0.8),
-            )
-
-    def test_calculate_probabilities_no_stages(self):
-        """ステージがない場合の確率計算テスト"""
-        result = self.simulator.calculate_probabilities()
-        self.assertEqual(len(result), 1)
-        self.assertIn("全選考で落選", result)
-        self.assertEqual(result["全選考で落選"], 1.0)
-
-    def test_calculate_probabilities(self):
-        """確率計算が正しく行われるかテスト"""
-        simulator = LotterySimulator(10000, 10, {"test": 1}, 1000)
-        simulator.add_stage("ステージ1", 0.5, 0, 1)
-        simulator.add_stage("ステージ2", 1.0, 0, 1)
-        result = simulator.calculate_probabilities()
-        self.assertAlmostEqual(
-            result["ステージ1で当選"], 1.0, places=2
-        )  # 席1000, 申込500 -> 当選率100%
-        self.assertAlmostEqual(
-            result["ステージ2で当選"], 0.0, places=2
-        )  # ステージ1で全員当選
-        self.assertAlmostEqual(result["全選考で落選"], 0.0, places=2)
-        self.assertAlmostEqual(sum(result.values()), 1.0, places=2)
-
-    def test_calculate_probabilities_with_duplicate(self):
-        """重複当選設定がある場合の確率計算テスト"""
+
+
+def test_calculate_probabilities_reuses_stage_invariants():
+    """重複当選設定のみ変更した場合に座席配分と前提申込者数が再利用されるかテスト"""
+    _solve_stages.cache_clear()
+    _solve_invariants.cache_clear()
+    simulator = LotterySimulator(10000, 10, {"test": 1}, 1000)
+    for stage_args in _TWO_STAGES:
+        simulator.add_stage(*stage_args)
+    simulator.calculate_probabilities()
+    allocated = simulator.stage_table.allocated
+
+    simulator.duplicate_当選_config = {"type": "seat_reduction", "rate": 0.2}
+    result = simulator.calculate_probabilities()
+    # 座席減少率の変更で確率計算はやり直すが、座席配分と前提申込者数は再利用される
+    assert _solve_stages.cache_info().misses == 2
+    invariants_info = _solve_invariants.cache_info()
+    assert (invariants_info.hits, invariants_info.misses) == (1, 1)
+    assert simulator.stage_table.allocated is allocated
+
+    expected_simulator = LotterySimulator(
+        10000, 10, {"test": 1}, 1000, {"type": "seat_reduction", "rate": 0.2}
+    )
+    for stage_args in _TWO_STAGES:
+        expected_simulator.add_stage(*stage_args)
+    assert result == expected_simulator.calculate_probabilities()
+
+    # ステージを追加した場合は再計算される
+    simulator.add_stage("ステージ3", 1.0, 0, 1)
+    simulator.calculate_probabilities()
+    assert _solve_invariants.cache_info().misses == 2
+    assert len(simulator.stage_table) == 3
+
+
+def test_calculate_probabilities_after_direct_stage_changes():
+    """ステージを直接変更した場合も、古い計算結果を使わずに再計算されるかテスト"""
+    simulator = LotterySimulator(10000, 10, {"test": 1}, 1000)
+    for stage_args in _TWO_STAGES:
+        simulator.add_stage(*stage_args)
+    simulator.calculate_probabilities()
+
+    # ステージ1の申込者を2倍の1000人にすると、席500に対し当選率は50%になる
+    simulator.stages[0].applicant_core_fan_ratio = 1.0
+    result = simulator.calculate_probabilities()
+    assert result["ステージ1で当選"] == pytest.approx(0.5)
+    assert simulator.stages[0].premise_applicants_for_stage_type == 1000
+
+    # ステージ1のみにすると、全座席1000がステージ1に配分される
+    simulator.stages = simulator.stages[:1]
+    assert simulator.calculate_probabilities() == {
+        "ステージ1で当選": 1.0,
+        "全選考で落選": 0.0,
+    }
+    assert simulator.stage_table.names == ["ステージ1"]
+    assert simulator.sweep_reduction_rates([0.5]) == [
+        {"ステージ1で当選": 0.5, "全選考で落選": 0.5}
+    ]
+    simulator._allocate_seats_to_stages()
+    assert simulator.stages[0].allocated_seats_original == 1000
+
+
+def test_calculate_probabilities_skips_rebuild_on_repeat():
+    """同じステージで再計算した場合に、テーブルの作り直しと書き戻しを省略するかテスト"""
+    simulator = LotterySimulator(10000, 10, {"test": 1}, 1000)
+    for stage_args in _TWO_STAGES:
+        simulator.add_stage(*stage_args)
+    first = simulator.calculate_probabilities()
+    table = simulator.stage_table
+    total_weight = simulator.total_weight
+
+    assert simulator.calculate_probabilities() is first
+    assert simulator.stage_table is table
+    # キャッシュのキーを組み立てても、シミュレーターの状態は変更されない
+    assert simulator.total_weight == total_weight
+
+    # ステージ名を変更した場合は、新しい名前で結果を作り直す
+    simulator.stages[0].name = "先行"
+    result = simulator.calculate_probabilities()
+    assert simulator.stage_table is not table
+    assert list(result) == ["先行で当選", "ステージ2で当選", "全選考で落選"]
+    assert simulator.stages[0].winners_in_stage == 500
+
+
+@pytest.mark.parametrize(
+    "duplicate_config, stages_def, expected",
+    [case[1:] for case in _CALCULATE_PROBABILITIES_CASES],
+    ids=[case[0] for case in _CALCULATE_PROBABILITIES_CASES],
+)
+def test_calculate_probabilities(
+    probability_base, duplicate_config, stages_def, expected
+):
+    """確率計算が正しく行われるかテスト（重複当選設定の有無、ステージなしを含む）"""
+    simulator = clone_simulator(probability_base)
+    simulator.duplicate_当選_config = duplicate_config
+    for stage_args in stages_def:
+        simulator.add_stage(*stage_args)
+    result = simulator.calculate_probabilities()
+
+    assert result.keys() == expected.keys()
+    for event, probability in expected.items():
+        assert result[event] == pytest.approx(probability, abs=5e-4)
+    assert sum(result.values()) == pytest.approx(1.0, abs=5e-4)
+    # 複製元のシミュレーターは変更されない
+    assert probability_base.stages == []
+    assert probability_base.final_probabilities == {}
+
+
+def test_calculate_probabilities_memoized():
+    """同じ入力の確率計算がインスタンスをまたいで再利用されるかテスト"""
+    _solve_stages.cache_clear()
+    simulators = []
+    for _ in range(2):
         simulator = LotterySimulator(
             10000, 10, {"test": 1}, 1000, {"type": "seat_reduction", "rate": 0.2}
         )
-        simulator.add_stage(
-            "ステージ1", 0.5, 0, 1
-        )  # 席500*0.8=400, 申込500 -> 当選率0.8
-        simulator.add_stage(
-            "ステージ2", 1.0, 0, 1
-        )  # 席500*0.8=400, 申込(1000-400)=600 -> 当選率400/600
-        result = simulator.calculate_probabilities()
-
-        # ステージ1: 席(1000/2)*0.8 = 400. 申込者 1000*0.5 = 500. 当選者 min(400,500)=400. 条件付当選率 400/500 = 0.8.
-        #           ステージ1当選確率 = 1.0 * 0.8 = 0.8
-        self.assertAlmostEqual(result["ステージ1で当選"], 0.8, places=3)
-
-        # ステージ2: 席(1000/2)*0.8 = 400.
-        #           前提申込者 1000*1.0 = 1000.
-        #           実質申込者 1000 - 400(ステージ1当選者) = 600.
-        #           当選者 min(400,600)=400. 条件付当選率 400/600 = 0.666...
-        #           ステージ2当選確率 = (1.0 - 0.8) * (400/600) = 0.2 * 0.666... = 0.1333...
-        self.assertAlmostEqual(result["ステージ2で当選"], 0.1333, places=3)
-
-        # 全選考で落選: (1.0 - 0.8) * (1 - 400/600) = 0.2 * (200/600) = 0.2 * 0.333... = 0.0666...
-        self.assertAlmostEqual(result["全選考で落選"], 0.0666, places=3)
-
-        self.assertAlmostEqual(sum(result.values()), 1.0, places=3)
-
-    @patch("builtins.print")
-    def test_display_results(self, mock_print):
-        """結果表示が正しく行われるかテスト"""
-        simulator = LotterySimulator(10000, 10, {"test": 1}, 1000)
-        simulator.add_stage("ステージ1", 0.5, 0, 1)
+        for stage_args in _TWO_STAGES:
+            simulator.add_stage(*stage_args)
+        simulators.append(simulator)
+
+    first = simulators[0].calculate_probabilities()
+    second = simulators[1].calculate_probabilities()
+    cache_info = _solve_stages.cache_info()
+    assert (cache_info.hits, cache_info.misses) == (1, 1)
+    assert second == first
+    assert second is not first
+    # キャッシュから復元した結果も各ステージへ書き戻される
+    assert simulators[1].stages[0].winners_in_stage == 400
+    assert simulators[1].stages[1].actual_applicants_for_stage == 600
+    # キャッシュと共有される配列は変更できない
+    with pytest.raises(ValueError):
+        simulators[1].stage_table.winners[0] = 0
+
+    # 設定を変更した場合は再計算される
+    simulators[1].duplicate_当選_config = {}
+    assert simulators[1].calculate_probabilities()["ステージ1で当選"] == pytest.approx(
+        1.0
+    )
+    assert _solve_stages.cache_info().misses == 2
+
+
+def test_calculate_probabilities_many_stages():
+    """多数のステージでも、ステージごとの逐次計算と同じ確率になるかテスト"""
+    stages_def = [
+        (f"ステージ{i}", (i % 10) / 10, (i * 37) % 500, 1 + i % 4) for i in range(50)
+    ]
+    # 総座席数1000に対しコアファン5000人とし、最終ステージまで申込者が残るようにする
+    simulator = LotterySimulator(
+        10000, 10, {"test": 1}, 5000, {"type": "seat_reduction", "rate": 0.1}
+    )
+    for stage_args in stages_def:
+        simulator.add_stage(*stage_args)
+    result = simulator.calculate_probabilities()
+
+    # 座席配分と前提申込者数は実装の結果を使い、確率の漸化式のみ逐次計算する
+    reach = 1.0
+    cumulative_winners = 0
+    for stage, (name, *_) in zip(simulator.stages, stages_def):
+        actual = max(stage.premise_applicants_for_stage_type - cumulative_winners, 0)
+        winners = min(actual, max(stage.effective_seats_for_new_winners, 0))
+        cond_prob = winners / actual if winners > 0 else 0.0
+        cumulative_winners += winners
+        assert result[f"{name}で当選"] == pytest.approx(reach * cond_prob)
+        reach *= 1 - cond_prob
+    assert len(result) == 51
+    assert result["ステージ49で当選"] > 0.0
+    assert result["全選考で落選"] == pytest.approx(reach)
+    assert sum(result.values()) == pytest.approx(1.0)
+
+
+def test_calculate_probabilities_skips_inactive_stages():
+    """申込者または有効席が0のステージが当選者0として扱われるかテスト"""
+    simulator = LotterySimulator(10000, 10, {"test": 1}, 1000)
+    simulator.add_stage("ステージ1", 0.3, 0, 1)  # 席333, 申込300 -> 全員当選
+    simulator.add_stage("ステージ2", 0.0, 0, 1)  # 申込0
+    simulator.add_stage("ステージ3", 1.0, 0, 1)  # 席334, 申込(1000-300)=700
+    result = simulator.calculate_probabilities()
+    stages = simulator.stages
+    assert stages[1].actual_applicants_for_stage == 0
+    assert stages[1].winners_in_stage == 0
+    assert stages[1].conditional_win_prob_in_stage == 0.0
+    assert stages[2].actual_applicants_for_stage == 700
+    assert stages[2].winners_in_stage == 334
+    assert result["ステージ2で当選"] == pytest.approx(0.0)
+    assert sum(result.values()) == pytest.approx(1.0)
+
+    # 有効席が0のステージは実質申込者数のみ計算される
+    simulator = LotterySimulator(
+        10000, 10, {"test": 1}, 1000, {"type": "seat_reduction", "rate": 1.0}
+    )
+    for stage_args in _TWO_STAGES:
+        simulator.add_stage(*stage_args)
+    result = simulator.calculate_probabilities()
+    assert simulator.stages[1].actual_applicants_for_stage == 1000
+    assert simulator.stages[1].winners_in_stage == 0
+    assert result["全選考で落選"] == 1.0
+
+
+def test_sweep_reduction_rates_matches_calculate_probabilities(simulator):
+    """一括計算の結果が座席減少率ごとの個別計算と一致するかテスト"""
+    stages_def = [
+        ("ステージ1", 0.3, 100, 3),
+        ("ステージ2", 0.6, 500, 2),
+        ("ステージ3", 0.0, 0, 1),
+        ("ステージ4", 1.0, 2000, 1),
+    ]
+    rates = [0.0, 0.15, 0.5, 1.0]
+    for stage_args in stages_def:
+        simulator.add_stage(*stage_args)
+    swept = simulator.sweep_reduction_rates(rates)
+    # 一括計算はシミュレーター自身の設定と計算結果を変更しない
+    assert simulator.duplicate_当選_config == {}
+    assert simulator.final_probabilities == {}
+
+    for rate, result in zip(rates, swept):
+        expected_simulator = LotterySimulator(
+            *BASE_SIMULATOR_ARGS, {"type": "seat_reduction", "rate": rate}
+        )
+        for stage_args in stages_def:
+            expected_simulator.add_stage(*stage_args)
+        assert result == expected_simulator.calculate_probabilities()
+    assert all(len(result) == len(stages_def) + 1 for result in swept)
+
+
+def test_sweep_reduction_rates_keeps_calculated_results():
+    """一括計算の後も、確率計算の結果と詳細表示が変わらないかテスト"""
+    simulator = LotterySimulator(
+        10000, 10, {"test": 1}, 1000, {"type": "seat_reduction", "rate": 0.2}
+    )
+    for stage_args in _TWO_STAGES:
+        simulator.add_stage(*stage_args)
+    simulator.calculate_probabilities()
+    before = []
+    simulator.display_results(display_details=True, writer=before.append)
+    table = simulator.stage_table
+
+    simulator.sweep_reduction_rates([0.0, 0.5])
+    simulator._allocate_seats_to_stages()
+    after = []
+    simulator.display_results(display_details=True, writer=after.append)
+    assert simulator.stage_table is table
+    assert after == before
+    assert simulator.stages[0].winners_in_stage == 400
+
+
+def test_sweep_reduction_rates_with_invalid_params(simulator):
+    """一括計算で不正な座席減少率やステージ無しが正しく扱われるかテスト"""
+    assert simulator.sweep_reduction_rates([0.0, 0.5]) == [
+        {"全選考で落選": 1.0},
+        {"全選考で落選": 1.0},
+    ]
+    simulator.add_stage("ステージ1", 0.5, 0, 1)
+    with pytest.raises(ValueError):
+        simulator.sweep_reduction_rates([0.1, 1.5])
+    # 比重の合計が0の場合は、確率計算と同じくエラーになる
+    simulator.stages[0].weight = 0
+    with pytest.raises(ValueError):
+        simulator.sweep_reduction_rates([0.0])
+
+
+def test_display_results(capsys):
+    """結果表示が正しく行われるかテスト"""
+    simulator = LotterySimulator(10000, 10, {"test": 1}, 1000)
+    simulator.add_stage("ステージ1", 0.5, 0, 1)
+    simulator.calculate_probabilities()
+    simulator.display_results()
+    summary = capsys.readouterr().out
+    assert "--- 当選確率シミュレーション結果 ---" in summary
+    assert "ステージ1で当選: 100.00%" in summary
+    assert "--- 各選考ステージ詳細 ---" not in summary
+
+    simulator.display_results(display_details=True)
+    # 詳細表示では各ステージの行が追加で表示される
+    details = capsys.readouterr().out
+    assert "--- 各選考ステージ詳細 ---" in details
+    assert len(details.splitlines()) > len(summary.splitlines())
+
+
+def test_display_results_single_write():
+    """表示内容が1つの文字列としてwriterへ一度だけ渡されるかテスト"""
+    simulator = LotterySimulator(10000, 10, {"test": 1}, 1000)
+    simulator.add_stage("ステージ1", 0.5, 0, 1)
+    simulator.calculate_probabilities()
+    msgs = []
+    simulator.display_results(display_details=True, writer=msgs.append)
+    assert len(msgs) == 1
+    assert "--- 各選考ステージ詳細 ---" in msgs[0]
+    assert msgs[0].endswith("-")
+
+
+def test_display_results_after_stage_change():
+    """計算後にステージを変更した場合、古い計算結果を表示せずに再計算を待つかテスト"""
+    simulator = LotterySimulator(10000, 10, {"test": 1}, 1000)
+    simulator.add_stage("ステージ1", 0.5, 0, 1)
+    simulator.calculate_probabilities()
+
+    for change_stages in (
+        lambda: simulator.add_stage("ステージ2", 1.0, 0, 1),
+        lambda: simulator.set_stages(freeze_stages(_TWO_STAGES)),
+    ):
+        change_stages()
+        assert simulator.stage_table is None
+        assert simulator.results_per_stage_raw == []
+        assert simulator.final_probabilities == {}
+        msgs = []
+        simulator.display_results(display_details=True, writer=msgs.append)
+        assert "--- 各選考ステージ詳細 ---" not in msgs[0]
+        assert "計算結果がありません。" in msgs[0]
         simulator.calculate_probabilities()
-        simulator.display_results()
-        self.assertTrue(mock_print.called)
 
-        mock_print.reset_mock()
-        simulator.display_results(display_details=True)
-        # 詳細表示ではより多くのprintが呼ばれるはず
-        # 具体的な呼び出し回数は実装に依存するが、最低でも基本表示より多いことを確認
-        self.assertTrue(mock_print.call_count > 5)  # 以前のテストより具体的な値
+
+def test_compute_stage_probs():
+    """前ステージの当選者を除いた実質申込者数で条件付き当選確率を計算するかテスト"""
+    actual, winners, cond_prob = _compute_stage_probs(
+        np.array([500, 1000], dtype=np.int64), np.array([400, 400], dtype=np.int64)
+    )
+    assert actual.tolist() == [500, 600]
+    assert winners.tolist() == [400, 400]
+    assert cond_prob.tolist() == [0.8, 400 / 600]
+    assert actual.dtype == np.int64
+    assert winners.dtype == np.int64
+    assert cond_prob.dtype == np.float64
 
 
-if __name__ == "__main__":
-    unittest.main()
+def test_compute_stage_probs_inactive_stages():
+    """申込者や有効席が無いステージ、申込者が尽きたステージが当選者0になるかテスト"""
+    actual, winners, cond_prob = _compute_stage_probs(
+        np.array([300, 0, 1000, 200], dtype=np.int64),
+        np.array([500, 500, 0, 500], dtype=np.int64),
+    )
+    assert actual.tolist() == [300, 0, 700, 0]
+    assert winners.tolist() == [300, 0, 0, 0]
+    assert cond_prob.tolist() == [1.0, 0.0, 0.0, 0.0]
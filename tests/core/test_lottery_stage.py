@@ -2,7 +2,7 @@
 
 import unittest
 
-from src.lottery.lottery_stage import LotteryStage
+from src.lottery.lottery_stage import FrozenStage, LotteryStage, freeze_stages
 
 
 class TestLotteryStage(unittest.TestCase):
@@ -26,6 +26,39 @@ class TestLotteryStage(unittest.TestCase):
         self.assertEqual(stage.winners_in_stage, 0)
         self.assertEqual(stage.conditional_win_prob_in_stage, 0.0)
 
+    def test_slots(self):
+        """インスタンスが__dict__を持たず、未定義の属性を追加できないかテスト"""
+        stage = LotteryStage("テスト", 0.5, 1000, 3)
+        self.assertFalse(hasattr(stage, "__dict__"))
+        with self.assertRaises(AttributeError):
+            stage.unknown_attribute = 1
+
+
+class TestFreezeStages(unittest.TestCase):
+    """freeze_stages関数のテスト"""
+
+    def test_freeze_stages(self):
+        """ステージ定義が検証済みのFrozenStageのタプルに変換されるかテスト"""
+        frozen_stages = freeze_stages(
+            [("テスト1", 0.3, 1000, 5), ("テスト2", 0.5, 0, 3)]
+        )
+        self.assertIsInstance(frozen_stages, tuple)
+        self.assertEqual(len(frozen_stages), 2)
+        self.assertIsInstance(frozen_stages[0], FrozenStage)
+        self.assertEqual(frozen_stages[0].name, "テスト1")
+        self.assertEqual(frozen_stages[1].weight, 3)
+        # 元のタプル定義と等価であることを確認
+        self.assertEqual(frozen_stages[1], ("テスト2", 0.5, 0, 3))
+
+    def test_freeze_stages_with_invalid_params(self):
+        """不正なステージ定義の変換時に例外が発生するかテスト"""
+        with self.assertRaises(ValueError):
+            freeze_stages([("テスト", 1.5, 1000, 5)])
+        with self.assertRaises(ValueError):
+            freeze_stages([("テスト", 0.5, -100, 5)])
+        with self.assertRaises(ValueError):
+            freeze_stages([("テスト1", 0.5, 1000, 5), ("テスト2", 0.5, 1000, 0)])
+
 
 if __name__ == "__main__":
     unittest.main()
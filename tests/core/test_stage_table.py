@@ -0,0 +1,86 @@
+"""StageTableクラスのテストモジュール"""
+
+import unittest
+
+import numpy as np
+
+from src.lottery.lottery_stage import LotteryStage
+from src.lottery.stage_table import StageTable
+
+
+class TestStageTable(unittest.TestCase):
+    """StageTableクラスのテスト"""
+
+    def setUp(self):
+        """各テスト前の共通セットアップ"""
+        self.stages = [
+            LotteryStage("テスト1", 0.3, 1000, 5),
+            LotteryStage("テスト2", 0.5, 2000, 3),
+        ]
+
+    def test_from_stages(self):
+        """LotteryStageのリストから配列が正しく生成されるかテスト"""
+        table = StageTable.from_stages(self.stages)
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.names, ["テスト1", "テスト2"])
+        np.testing.assert_array_equal(table.weight, [5, 3])
+        np.testing.assert_array_equal(table.ratio, [0.3, 0.5])
+        np.testing.assert_array_equal(table.additional, [1000, 2000])
+        self.assertEqual(table.additional.dtype, np.int64)
+        # 計算結果の配列はステージ数分ゼロで確保されているか確認
+        for column in (
+            table.allocated,
+            table.effective,
+            table.premise,
+            table.actual,
+            table.winners,
+        ):
+            self.assertEqual(column.dtype, np.int64)
+            np.testing.assert_array_equal(column, [0, 0])
+        self.assertEqual(table.cond_prob.dtype, np.float64)
+        np.testing.assert_array_equal(table.cond_prob, [0.0, 0.0])
+
+    def test_rows(self):
+        """表示用の行が正しい順序で返されるかテスト"""
+        table = StageTable.from_stages(self.stages)
+        table.allocated = np.array([600, 400])
+        table.cond_prob = np.array([0.5, 0.25])
+        rows = list(table.rows())
+        self.assertEqual(rows[0], ("テスト1", 600, 0, 0, 0, 0, 0.5))
+        self.assertEqual(rows[1], ("テスト2", 400, 0, 0, 0, 0, 0.25))
+
+    def test_write_back(self):
+        """計算結果がLotteryStageへ正しく書き戻されるかテスト"""
+        table = StageTable.from_stages(self.stages)
+        table.allocated = np.array([600, 400])
+        table.effective = np.array([540, 360])
+        table.premise = np.array([1300, 2500])
+        table.actual = np.array([1300, 1960])
+        table.winners = np.array([540, 360])
+        table.cond_prob = np.array([540 / 1300, 360 / 1960])
+        table.write_back(self.stages)
+
+        self.assertEqual(self.stages[0].allocated_seats_original, 600)
+        self.assertIsInstance(self.stages[0].allocated_seats_original, int)
+        self.assertEqual(self.stages[1].effective_seats_for_new_winners, 360)
+        self.assertEqual(self.stages[1].premise_applicants_for_stage_type, 2500)
+        self.assertEqual(self.stages[1].actual_applicants_for_stage, 1960)
+        self.assertEqual(self.stages[0].winners_in_stage, 540)
+        self.assertAlmostEqual(self.stages[1].conditional_win_prob_in_stage, 360 / 1960)
+
+    def test_write_back_seats(self):
+        """座席の列のみが書き戻され、確率計算の結果は変更されないかテスト"""
+        self.stages[0].winners_in_stage = 100
+        table = StageTable.from_stages(self.stages)
+        table.allocated = np.array([600, 400])
+        table.effective = np.array([540, 360])
+        table.write_back_seats(self.stages)
+
+        self.assertEqual(self.stages[0].allocated_seats_original, 600)
+        self.assertIsInstance(self.stages[0].allocated_seats_original, int)
+        self.assertEqual(self.stages[1].effective_seats_for_new_winners, 360)
+        self.assertEqual(self.stages[0].winners_in_stage, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+"""テストモジュールとフィクスチャで共有するテスト用のヘルパー"""
+
+import copy
+
+from src.lottery.lottery_simulator import LotterySimulator
+
+# 基準となるシミュレーターの引数（総動員数, 全公演数, 申込公演の詳細, コアファン人口）
+BASE_SIMULATOR_ARGS = (100000, 10, {"tokyo": 2, "osaka": 1}, 50000)
+
+
+def clone_simulator(base: LotterySimulator) -> LotterySimulator:
+    """ステージと計算結果を持たない状態で、シミュレーターを複製する関数
+
+    copy.copyは浅い複製のため、ステージや計算結果を保持する属性は初期状態に
+    作り直し、複製元と共有しないようにします。
+
+    Args:
+        base (LotterySimulator): 複製元のシミュレーター
+
+    Returns:
+        LotterySimulator: 複製元と同じ設定で、ステージが追加されていないシミュレーター
+    """
+    simulator = copy.copy(base)
+    simulator.stages = []
+    simulator.total_weight = 0
+    simulator.stage_table = None
+    simulator.results_per_stage_raw = []
+    simulator.final_probabilities = {}
+    return simulator
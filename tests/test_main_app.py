@@ -1,11 +1,17 @@
 """src.__main__ モジュールのテスト"""
 
+import io
 import unittest
 from unittest.mock import MagicMock, patch
 
-from src.__main__ import (
-    run_and_collect_results,  # main関数は直接テストせず、run_and_collect_resultsをテスト
+from src.__main__ import (  # main関数は直接テストせず、run_and_collect_resultsをテスト
+    _simulate_case,
+    parse_args,
+    run_and_collect_results,
+    run_cases,
+    run_cases_sweep,
 )
+from src.lottery.lottery_stage import freeze_stages
 
 
 class TestRunAndCollectResults(unittest.TestCase):
@@ -21,6 +27,7 @@ class TestRunAndCollectResults(unittest.TestCase):
         self.user_target_events_details = {"test": 1}
         self.stages_def = [("ステージ1", 0.5, 0, 1)]
         self.expected_result_dict = {"テスト結果": 1.0}
+        _simulate_case.cache_clear()
 
     # LotterySimulatorは __main__ モジュール内で core.lottery_simulator からインポートされるため、
     # __main__ の名前空間でパッチする
@@ -56,6 +63,77 @@ class TestRunAndCollectResults(unittest.TestCase):
         self.assertTrue(mock_simulator_instance.display_results.called)
         self.assertEqual(result, self.expected_result_dict)
 
+    @patch("builtins.print")
+    def test_run_and_collect_results_without_duplicate_config(self, mock_print):
+        """重複当選設定がNoneの場合に設定なしとして計算されるかテスト"""
+        expected = run_and_collect_results(
+            self.simulation_settings,
+            self.user_target_events_details,
+            {},
+            "設定なし",
+            self.stages_def,
+        )
+        result = run_and_collect_results(
+            self.simulation_settings,
+            self.user_target_events_details,
+            None,
+            "設定None",
+            self.stages_def,
+        )
+        self.assertIsNotNone(result)
+        self.assertEqual(result, expected)
+
+    @patch("src.__main__.LotterySimulator")
+    @patch("builtins.print")
+    def test_run_and_collect_results_cached(self, mock_print, mock_simulator_class):
+        """同じ入力での再実行時に計算結果が再利用されるかテスト"""
+        mock_simulator_instance = MagicMock()
+        mock_simulator_class.return_value = mock_simulator_instance
+        mock_simulator_instance.final_probabilities = self.expected_result_dict
+
+        args = (
+            self.simulation_settings,
+            self.user_target_events_details,
+            {"type": "seat_reduction", "rate": 0.1},
+            "テストケース",
+            self.stages_def,
+        )
+        first = run_and_collect_results(*args)
+        second = run_and_collect_results(*args)
+
+        self.assertEqual(mock_simulator_class.call_count, 1)
+        self.assertEqual(mock_simulator_instance.calculate_probabilities.call_count, 1)
+        # 結果の表示はキャッシュの有無に関わらず毎回行われる
+        self.assertEqual(mock_simulator_instance.display_results.call_count, 2)
+        self.assertEqual(first, self.expected_result_dict)
+        # 返却された辞書を変更してもキャッシュに影響しないことを確認
+        first["テスト結果"] = 0.0
+        self.assertEqual(second, self.expected_result_dict)
+        self.assertIsNot(first, second)
+
+    @patch("src.__main__.LotterySimulator")
+    @patch("builtins.print")
+    def test_run_and_collect_results_with_frozen_stages(
+        self, mock_print, mock_simulator_class
+    ):
+        """検証済みステージ定義を渡した場合に一括設定されるかテスト"""
+        mock_simulator_instance = MagicMock()
+        mock_simulator_class.return_value = mock_simulator_instance
+        mock_simulator_instance.final_probabilities = self.expected_result_dict
+        frozen_stages = freeze_stages(self.stages_def)
+
+        result = run_and_collect_results(
+            self.simulation_settings,
+            self.user_target_events_details,
+            {},
+            "テストケース",
+            frozen_stages,
+        )
+
+        mock_simulator_instance.set_stages.assert_called_once_with(frozen_stages)
+        self.assertFalse(mock_simulator_instance.add_stage.called)
+        self.assertEqual(result, self.expected_result_dict)
+
     @patch("src.__main__.LotterySimulator")
     @patch("builtins.print")
     def test_run_and_collect_results_with_value_error(
@@ -77,5 +155,155 @@ class TestRunAndCollectResults(unittest.TestCase):
         mock_print.assert_any_call("設定エラー (エラーケース): テスト設定エラー")
 
 
+class TestParseArgs(unittest.TestCase):
+    """parse_args関数のテスト"""
+
+    def test_parse_args_default(self):
+        """引数なしでは設定内容を表示しないかテスト"""
+        self.assertFalse(parse_args([]).verbose_config)
+
+    def test_parse_args_verbose_config(self):
+        """--verbose-configで設定内容の表示が有効になるかテスト"""
+        self.assertTrue(parse_args(["--verbose-config"]).verbose_config)
+
+    def test_parse_args_sweep(self):
+        """--sweepで一括計算が有効になるかテスト"""
+        self.assertFalse(parse_args([]).sweep)
+        self.assertTrue(parse_args(["--sweep"]).sweep)
+
+    def test_parse_args_jobs(self):
+        """--jobsで並列実行のプロセス数を指定でき、既定では直列に実行するかテスト"""
+        self.assertEqual(parse_args([]).jobs, 1)
+        self.assertEqual(parse_args(["--jobs", "4"]).jobs, 4)
+        for invalid in ("0", "abc"):
+            with patch("sys.stderr", new_callable=io.StringIO):
+                with self.assertRaises(SystemExit):
+                    parse_args(["--jobs", invalid])
+
+
+class TestRunCases(unittest.TestCase):
+    """run_cases関数のテスト"""
+
+    def setUp(self):
+        """各テスト前の共通セットアップ"""
+        simulation_settings = {
+            "total_overall_attendance": 10000,
+            "num_total_events": 10,
+            "core_fan_total_population": 1000,
+        }
+        stages_def = freeze_stages([("ステージ1", 0.5, 0, 1), ("ステージ2", 1.0, 0, 1)])
+        self.case_args_list = [
+            (
+                simulation_settings,
+                {"test": 1},
+                {"type": "seat_reduction", "rate": rate},
+                f"ケース{i}",
+                stages_def,
+            )
+            for i, rate in enumerate([0.0, 0.1, 0.2, 0.3])
+        ]
+        _simulate_case.cache_clear()
+
+    def test_run_cases_parallel_matches_serial(self):
+        """並列実行と直列実行で同じ順序・同じ結果になるかテスト"""
+        with patch("sys.stdout", new_callable=io.StringIO) as serial_stdout:
+            serial_results = run_cases(self.case_args_list)
+        _simulate_case.cache_clear()
+        with patch("sys.stdout", new_callable=io.StringIO) as parallel_stdout:
+            parallel_results = run_cases(self.case_args_list, jobs=2)
+
+        self.assertEqual(parallel_results, serial_results)
+        self.assertEqual(parallel_stdout.getvalue(), serial_stdout.getvalue())
+        self.assertAlmostEqual(parallel_results[2]["ステージ1で当選"], 0.8, places=3)
+
+    @patch("src.__main__.multiprocessing.Pool")
+    def test_run_cases_serial_by_default(self, mock_pool):
+        """jobsを指定しない場合はプロセスプールを起動せずに直列で実行するかテスト"""
+        with patch("sys.stdout", new_callable=io.StringIO):
+            results = run_cases(self.case_args_list)
+        self.assertFalse(mock_pool.called)
+        self.assertEqual(len(results), len(self.case_args_list))
+
+    def test_run_cases_sweep_matches_run_cases(self):
+        """一括計算で個別実行と同じ結果になるかテスト"""
+        with patch("sys.stdout", new_callable=io.StringIO):
+            expected = run_cases(self.case_args_list)
+        with patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+            results = run_cases_sweep(self.case_args_list)
+
+        self.assertEqual(results, expected)
+        output = mock_stdout.getvalue()
+        for case_args in self.case_args_list:
+            self.assertIn(f"--- シミュレーションケース: {case_args[3]} ---", output)
+
+    def test_run_cases_sweep_with_invalid_rate(self):
+        """座席減少率が不正なケースのみNoneになるかテスト"""
+        settings, events, _, _, stages_def = self.case_args_list[0]
+        case_args_list = [
+            self.case_args_list[0],
+            (
+                settings,
+                events,
+                {"type": "seat_reduction", "rate": 1.5},
+                "不正",
+                stages_def,
+            ),
+        ]
+        with patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+            results = run_cases_sweep(case_args_list)
+
+        self.assertIsNotNone(results[0])
+        self.assertIsNone(results[1])
+        self.assertIn("設定エラー (不正)", mock_stdout.getvalue())
+
+    def test_run_cases_sweep_with_unexpected_error(self):
+        """設定エラー以外の例外も実行全体を止めずにケースごとに表示されるかテスト"""
+        settings, events, _, _, stages_def = self.case_args_list[0]
+        case_args_list = [
+            self.case_args_list[0],
+            (
+                settings,
+                events,
+                {"type": "seat_reduction", "rate": None},
+                "不正",
+                stages_def,
+            ),
+        ]
+        with patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+            results = run_cases_sweep(case_args_list)
+
+        self.assertIsNotNone(results[0])
+        self.assertIsNone(results[1])
+        self.assertIn("予期せぬエラー (不正)", mock_stdout.getvalue())
+
+        # シミュレーターの構築に失敗した場合は、全ケースが予期せぬエラーになる
+        broken_settings = {"total_overall_attendance": 10000}
+        broken_list = [
+            (broken_settings, events, {}, "ケースA", stages_def),
+            (broken_settings, events, {}, "ケースB", stages_def),
+        ]
+        with patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+            results = run_cases_sweep(broken_list)
+
+        self.assertEqual(results, [None, None])
+        self.assertIn("予期せぬエラー (ケースA)", mock_stdout.getvalue())
+        self.assertIn("予期せぬエラー (ケースB)", mock_stdout.getvalue())
+
+    def test_run_cases_sweep_falls_back_for_mismatched_cases(self):
+        """重複当選の設定以外が異なるケースでは個別実行に切り替わるかテスト"""
+        settings, events, duplicate_config, _, stages_def = self.case_args_list[0]
+        case_args_list = [
+            self.case_args_list[0],
+            (settings, {"test": 2}, duplicate_config, "公演数違い", stages_def),
+        ]
+        with patch("sys.stdout", new_callable=io.StringIO):
+            expected = run_cases(case_args_list)
+        with patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+            results = run_cases_sweep(case_args_list)
+
+        self.assertEqual(results, expected)
+        self.assertIn("個別に実行します: 公演数違い", mock_stdout.getvalue())
+
+
 if __name__ == "__main__":
     unittest.main()
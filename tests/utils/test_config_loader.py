@@ -1,79 +1,99 @@
 """config_loaderモジュールのテスト"""
 
 import json
-import os
-import tempfile
-import unittest
-from unittest.mock import patch
-
-from src.utils.config_loader import load_config
-
-
-class TestLoadConfig(unittest.TestCase):
-    """load_config関数のテスト"""
-
-    def setUp(self):
-        self.test_config_data = {
-            "simulation_settings": {"total_overall_attendance": 10000},
-            "user_target_events_details": {"test": 1},
-            "lottery_stages_definition": [{"name": "ステージ1"}],
-            "simulation_cases_to_run": [{"case_name": "テストケース"}],
-        }
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.config_path = os.path.join(self.temp_dir.name, "test_config.json")
-        with open(self.config_path, "w", encoding="utf-8") as f:
-            json.dump(self.test_config_data, f)
-
-    def tearDown(self):
-        self.temp_dir.cleanup()
-
-    @patch("builtins.print")
-    def test_load_config_success(self, mock_print):
-        """設定ファイルの読み込みが成功するかテスト"""
-        config = load_config(self.config_path)
-        self.assertIsNotNone(config)
-        self.assertEqual(
-            config["simulation_settings"]["total_overall_attendance"], 10000
-        )
-        mock_print.assert_called_with(
-            f"設定ファイル '{self.config_path}' を読み込みました"
-        )
-
-    @patch("builtins.print")
-    def test_load_config_file_not_found(self, mock_print):
-        """存在しないファイルの読み込み時のテスト"""
-        config = load_config("non_existent_file.json")
-        self.assertEqual(config, {})
-        mock_print.assert_called_with(
-            "エラー: 設定ファイル 'non_existent_file.json' が見つかりません"
-        )
-
-    @patch("builtins.print")
-    def test_load_config_invalid_json(self, mock_print):
-        """不正なJSONファイルの読み込み時のテスト"""
-        invalid_json_path = os.path.join(self.temp_dir.name, "invalid.json")
-        with open(invalid_json_path, "w", encoding="utf-8") as f:
-            f.write("{不正なJSON")
-        config = load_config(invalid_json_path)
-        self.assertEqual(config, {})
-        self.assertTrue(
-            mock_print.call_args[0][0].startswith(
-                f"エラー: 設定ファイル '{invalid_json_path}' のJSONフォーマットが不正です:"
-            )
-        )
-
-    @patch("builtins.print")
-    def test_load_config_generic_exception(self, mock_print):
-        """その他の例外発生時のテスト"""
-        with patch("builtins.open", side_effect=Exception("Test general error")):
-            config = load_config(self.config_path)
-            self.assertEqual(config, {})
-            self.assertTrue(
-                mock_print.call_args[0][0].startswith(
-                    f"エラー: 設定ファイル '{self.config_path}' の読み込み中に問題が発生しました:"
-                )
-            )
-
-
-if __name__ == "__main__":
-    unittest.main()
+from unittest.mock import mock_open, patch
+
+import pytest
+
+from src.utils.config_loader import clear_config_cache, load_config
+
+CONFIG_PATH = "test_config.json"
+
+
+@pytest.fixture(scope="module")
+def config_data():
+    """ファイルの代わりに読み込ませる設定内容"""
+    return {
+        "simulation_settings": {"total_overall_attendance": 10000},
+        "user_target_events_details": {"test": 1},
+        "lottery_stages_definition": [{"name": "ステージ1"}],
+        "simulation_cases_to_run": [{"case_name": "テストケース"}],
+    }
+
+
+@pytest.fixture(scope="module")
+def config_bytes(config_data):
+    """設定ファイルはバイナリモードで読み込まれるため、bytesとして用意する"""
+    return json.dumps(config_data).encode("utf-8")
+
+
+@pytest.fixture(autouse=True)
+def _clear_config_cache():
+    """テスト間でキャッシュした設定を共有しないよう、各テスト後に破棄する"""
+    yield
+    clear_config_cache()
+
+
+def _mock_config_file(read_data):
+    """builtins.openをインメモリの設定ファイルに差し替えるパッチを返す関数"""
+    return patch("builtins.open", mock_open(read_data=read_data))
+
+
+def test_load_config_success(config_bytes):
+    """設定ファイルの読み込みが成功するかテスト"""
+    msgs = []
+    with _mock_config_file(config_bytes):
+        config = load_config(CONFIG_PATH, writer=msgs.append)
+    assert config is not None
+    assert config["simulation_settings"]["total_overall_attendance"] == 10000
+    assert msgs[-1] == f"設定ファイル '{CONFIG_PATH}' を読み込みました"
+
+
+def test_load_config_without_orjson(config_data, config_bytes):
+    """orjsonが無い環境でも標準ライブラリのjsonで読み込めるかテスト"""
+    msgs = []
+    with patch("src.utils.config_loader.orjson", None), _mock_config_file(config_bytes):
+        config = load_config(CONFIG_PATH, writer=msgs.append)
+    assert config == config_data
+
+
+def test_load_config_with_cache(config_bytes):
+    """キャッシュ有効時に2回目以降はファイルを再読み込みしないかテスト"""
+    msgs = []
+    with _mock_config_file(config_bytes):
+        first = load_config(CONFIG_PATH, use_cache=True, writer=msgs.append)
+    with patch("builtins.open", side_effect=AssertionError("再読み込みされた")):
+        second = load_config(CONFIG_PATH, use_cache=True, writer=msgs.append)
+    assert second == first
+    assert msgs[-1] == f"設定ファイル '{CONFIG_PATH}' を読み込みました"
+
+
+def test_load_config_file_not_found():
+    """存在しないファイルの読み込み時のテスト"""
+    msgs = []
+    config = load_config("non_existent_file.json", writer=msgs.append)
+    assert config == {}
+    assert msgs[-1] == "エラー: 設定ファイル 'non_existent_file.json' が見つかりません"
+
+
+def test_load_config_invalid_json():
+    """不正なJSONファイルの読み込み時のテスト"""
+    msgs = []
+    invalid_json_path = "invalid.json"
+    with _mock_config_file(b"{invalid"):
+        config = load_config(invalid_json_path, writer=msgs.append)
+    assert config == {}
+    assert msgs[-1].startswith(
+        f"エラー: 設定ファイル '{invalid_json_path}' のJSONフォーマットが不正です:"
+    )
+
+
+def test_load_config_generic_exception():
+    """その他の例外発生時のテスト"""
+    msgs = []
+    with patch("builtins.open", side_effect=Exception("Test general error")):
+        config = load_config(CONFIG_PATH, writer=msgs.append)
+    assert config == {}
+    assert msgs[-1].startswith(
+        f"エラー: 設定ファイル '{CONFIG_PATH}' の読み込み中に問題が発生しました:"
+    )
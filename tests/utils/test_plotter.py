@@ -1,22 +1,40 @@
 """plotterモジュールのテスト"""
 
 import unittest
+from types import MappingProxyType
 from unittest.mock import MagicMock, patch
 
-from src.utils.plotter import plot_probability_comparison
+from src.utils.plotter import (
+    _build_probability_matrix,
+    _get_stage_layout,
+    _sort_stage_keys,
+    plot_probability_comparison,
+)
+
+# plt.subplotsが返すFigureとAxesのモックは全テストで共有し、setUpでリセットして再利用する
+_FIG, _AX = MagicMock(), MagicMock()
 
 
 class TestPlotProbabilityComparison(unittest.TestCase):
     """plot_probability_comparison関数のテスト"""
 
+    def setUp(self):
+        """共有モックの呼び出し履歴をリセットし、共通の戻り値を設定する"""
+        _FIG.reset_mock()
+        _AX.reset_mock()
+        _AX.get_legend_handles_labels.return_value = (
+            [MagicMock()] * 3,
+            ["S1", "S2", "Lose"],
+        )
+
+    @patch("src.utils.plotter.plt.close")
     @patch("src.utils.plotter.plt.show")
     @patch("src.utils.plotter.plt.subplots")
     def test_plot_probability_comparison(
-        self, mock_subplots: MagicMock, mock_show: MagicMock
+        self, mock_subplots: MagicMock, mock_show: MagicMock, mock_close: MagicMock
     ) -> None:
         """グラフ描画が正しく行われるかテスト"""
-        mock_fig = MagicMock()
-        mock_ax = MagicMock()
+        mock_fig, mock_ax = _FIG, _AX
         mock_subplots.return_value = (mock_fig, mock_ax)
 
         results_list = [
@@ -29,37 +47,180 @@ class TestPlotProbabilityComparison(unittest.TestCase):
             "ステージ2で当選": "S2",
             "全選考で落選": "Lose",
         }
-        # Configure mock_ax.get_legend_handles_labels to return a tuple of two lists
-        # This simulates that legend handles and labels were generated.
-        # The actual labels would depend on stage_map and the sorting in plotter.py
-        # For this test, we can use the values from stage_map directly.
-        expected_legend_labels = list(stage_map.values())
-        mock_ax.get_legend_handles_labels.return_value = ([MagicMock()] * len(expected_legend_labels), expected_legend_labels)
+        # 凡例のハンドルとラベルは、setUpでstage_mapの表示名と同じ値が設定済み
 
         plot_probability_comparison(results_list, case_names, stage_map)
 
         self.assertTrue(mock_subplots.called)
-        self.assertTrue(mock_ax.barh.called) # Changed from bar to barh
-        # Since barh is called for each segment of each case,
-        # we can check if it was called at least once.
-        self.assertGreaterEqual(mock_ax.barh.call_count, 1)
+        # ケースは横棒グラフ(barh)で描画され、縦棒グラフ(bar)は使われない
+        self.assertTrue(mock_ax.barh.called)
+        self.assertFalse(mock_ax.bar.called)
+        # barhはステージごとに全ケース分のセグメントをまとめて1回ずつ呼ばれる
+        self.assertEqual(mock_ax.barh.call_count, len(stage_map))
         self.assertTrue(mock_ax.set_ylabel.called)
-        self.assertTrue(mock_ax.set_xlabel.called) # Check for xlabel as well
+        self.assertTrue(mock_ax.set_xlabel.called)  # Check for xlabel as well
         self.assertTrue(mock_ax.set_title.called)
-        self.assertTrue(mock_ax.set_yticks.called) # Check for yticks
-        self.assertTrue(mock_ax.set_yticklabels.called) # Check for yticklabels
+        self.assertTrue(mock_ax.set_yticks.called)  # Check for yticks
+        self.assertTrue(mock_ax.set_yticklabels.called)  # Check for yticklabels
         self.assertTrue(mock_ax.legend.called)
         self.assertTrue(mock_show.called)
+        mock_close.assert_called_once_with(mock_fig)
+
+    @patch("src.utils.plotter.plt.close")
+    @patch("src.utils.plotter.plt.show")
+    @patch("src.utils.plotter.plt.subplots")
+    def test_plot_probability_comparison_one_barh_per_stage(
+        self, mock_subplots: MagicMock, mock_show: MagicMock, mock_close: MagicMock
+    ) -> None:
+        """ステージごとに全ケース分のセグメントがまとめて描画されるかテスト"""
+        mock_fig, mock_ax = _FIG, _AX
+        mock_subplots.return_value = (mock_fig, mock_ax)
+
+        results_list = [
+            {"1次で当選": 0.5, "2次で当選": 0.0, "全選考で落選": 0.5},
+            {"1次で当選": 0.2, "2次で当選": 0.0, "全選考で落選": 0.8},
+        ]
+        plot_probability_comparison(results_list, ["ケース1", "ケース2"])
 
-    @patch("builtins.print")
-    def test_plot_probability_comparison_invalid_input(
-        self, mock_print: MagicMock
+        # 確率が全ケースで0の「2次」は描画されない
+        self.assertEqual(mock_ax.barh.call_count, 2)
+        first_call = mock_ax.barh.call_args_list[0]
+        self.assertEqual(list(first_call.args[1]), [50.0, 20.0])
+        self.assertEqual(list(first_call.kwargs["left"]), [0.0, 0.0])
+        second_call = mock_ax.barh.call_args_list[1]
+        self.assertEqual(list(second_call.args[1]), [50.0, 80.0])
+        self.assertEqual(list(second_call.kwargs["left"]), [50.0, 20.0])
+        # テキストはステージごとにbar_labelでまとめて配置される
+        self.assertEqual(mock_ax.bar_label.call_count, 2)
+        self.assertFalse(mock_ax.text.called)
+        self.assertEqual(
+            mock_ax.bar_label.call_args_list[0].kwargs["labels"], ["50.0%", "20.0%"]
+        )
+
+    @patch("src.utils.plotter.plt.close")
+    @patch("src.utils.plotter.plt.show")
+    @patch("src.utils.plotter.plt.subplots")
+    def test_plot_probability_comparison_label_colors(
+        self, mock_subplots: MagicMock, mock_show: MagicMock, mock_close: MagicMock
+    ) -> None:
+        """10%超は白、3%超10%以下は黒の文字色でまとめてラベル付けされるかテスト"""
+        mock_subplots.return_value = (_FIG, _AX)
+
+        plot_probability_comparison(
+            [
+                {"1次で当選": 0.5, "全選考で落選": 0.5},
+                {"1次で当選": 0.05, "全選考で落選": 0.95},
+                {"1次で当選": 0.02, "全選考で落選": 0.98},
+            ],
+            ["ケース1", "ケース2", "ケース3"],
+        )
+
+        first_stage_calls = _AX.bar_label.call_args_list[:2]
+        self.assertEqual(
+            [
+                (call.kwargs["color"], call.kwargs["labels"])
+                for call in first_stage_calls
+            ],
+            [("white", ["50.0%", "", ""]), ("black", ["", "5.0%", ""])],
+        )
+        # 「全選考で落選」は全ケース10%超のため、白文字の1回のみ
+        self.assertEqual(_AX.bar_label.call_count, 3)
+        self.assertEqual(_AX.bar_label.call_args_list[2].kwargs["color"], "white")
+
+    @patch("src.utils.plotter.plt.close")
+    @patch("src.utils.plotter.plt.show")
+    @patch("src.utils.plotter.plt.subplots")
+    def test_plot_probability_comparison_savepath(
+        self, mock_subplots: MagicMock, mock_show: MagicMock, mock_close: MagicMock
     ) -> None:
+        """保存先を指定した場合に表示せず画像として保存されるかテスト"""
+        mock_fig, mock_ax = _FIG, _AX
+        mock_subplots.return_value = (mock_fig, mock_ax)
+
+        plot_probability_comparison(
+            [{"1次で当選": 0.5, "全選考で落選": 0.5}, {"全選考で落選": 1.0}],
+            ["ケース1", "ケース2"],
+            savepath="comparison.png",
+        )
+
+        mock_fig.savefig.assert_called_once_with("comparison.png", dpi=100)
+        self.assertFalse(mock_show.called)
+        mock_close.assert_called_once_with(mock_fig)
+
+    def test_plot_probability_comparison_invalid_input(self) -> None:
         """不正な入力でのグラフ描画テスト"""
-        plot_probability_comparison([], [])
-        mock_print.assert_called_with("描画データまたはケース名が不適切です。")
-        plot_probability_comparison([{}], ["ケース1", "ケース2"])
-        mock_print.assert_called_with("描画データまたはケース名が不適切です。")
+        msgs = []
+        plot_probability_comparison([], [], writer=msgs.append)
+        plot_probability_comparison([{}], ["ケース1", "ケース2"], writer=msgs.append)
+        self.assertEqual(msgs, ["描画データまたはケース名が不適切です。"] * 2)
+
+
+class TestBuildProbabilityMatrix(unittest.TestCase):
+    """_build_probability_matrix関数のテスト"""
+
+    def test_build_probability_matrix(self):
+        """結果辞書がケース×ステージの確率行列(%)に変換されるかテスト"""
+        results_list = [
+            {"1次で当選": 0.5, "全選考で落選": 0.5},
+            {"1次で当選": 0.25, "2次で当選": 0.25, "全選考で落選": 0.5},
+        ]
+        matrix = _build_probability_matrix(
+            results_list, ["1次で当選", "2次で当選", "全選考で落選"]
+        )
+        self.assertEqual(matrix.shape, (2, 3))
+        self.assertEqual(matrix.tolist(), [[50.0, 0.0, 50.0], [25.0, 25.0, 50.0]])
+
+    def test_build_probability_matrix_without_keys(self):
+        """ステージが無い場合も形状が保たれるかテスト"""
+        matrix = _build_probability_matrix([{}, {}], [])
+        self.assertEqual(matrix.shape, (2, 0))
+
+
+class TestSortStageKeys(unittest.TestCase):
+    """_sort_stage_keys関数のテスト"""
+
+    def test_sort_stage_keys(self):
+        """ステージ番号順に並び、落選が最後になるかテスト"""
+        keys = frozenset(
+            ["全選考で落選", "10次で当選", "2次で当選", "特別枠で当選", "1次で当選"]
+        )
+        self.assertEqual(
+            _sort_stage_keys(keys),
+            ("1次で当選", "2次で当選", "10次で当選", "全選考で落選", "特別枠で当選"),
+        )
+        # 同じキー構成では同じ並び順が再利用される
+        self.assertIs(_sort_stage_keys(frozenset(keys)), _sort_stage_keys(keys))
+
+
+class TestGetStageLayout(unittest.TestCase):
+    """_get_stage_layout関数のテスト"""
+
+    def setUp(self):
+        self.stage_keys = frozenset(["2次で当選", "1次で当選", "全選考で落選"])
+
+    def test_get_stage_layout(self):
+        """並び順と表示名が正しく生成されるかテスト"""
+        sorted_keys, display_names = _get_stage_layout(
+            self.stage_keys, {"全選考で落選": "全滅"}
+        )
+        self.assertEqual(sorted_keys, ("1次で当選", "2次で当選", "全選考で落選"))
+        self.assertEqual(display_names, ("1次", "2次", "全滅"))
+
+    def test_get_stage_layout_cached_for_read_only_map(self):
+        """変更不可のマッピングでは計算結果が再利用されるかテスト"""
+        stage_name_map = MappingProxyType({"1次で当選": "S1"})
+        first = _get_stage_layout(self.stage_keys, stage_name_map)
+        second = _get_stage_layout(frozenset(self.stage_keys), stage_name_map)
+        self.assertIs(second[1], first[1])
+        self.assertEqual(first[1], ("S1", "2次", "全選考で落選"))
+
+    def test_get_stage_layout_not_cached_for_dict(self):
+        """変更可能な辞書では変更内容が反映されるかテスト"""
+        stage_name_map = {"1次で当選": "S1"}
+        _get_stage_layout(self.stage_keys, stage_name_map)
+        stage_name_map["1次で当選"] = "First"
+        _, display_names = _get_stage_layout(self.stage_keys, stage_name_map)
+        self.assertEqual(display_names[0], "First")
 
 
 if __name__ == "__main__":